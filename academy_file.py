@@ -0,0 +1,260 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+from array import array
+from collections.abc import Mapping
+from course_table import CourseTable, CourseView
+import mmap
+import struct
+import sys
+
+class AcademyFile(Mapping):
+    """Class that reads the courses of an academy from a binary file mapped in memory (mmap).
+
+    The file stores the courses by columns, like a CourseTable:
+    a block with the keys in increasing order, a fixed-width column for each number,
+    a column of codes for the level and the language, and a table with all the strings.
+    The courses are read from the mapped pages when they are needed, so opening a file
+    does not parse it nor create the courses. Each course is returned as a CourseView.
+
+    Attributes
+    ----------
+    None.
+
+    Methods
+    -------
+    write(academy, file_name):
+        Writes the courses of a tree in a binary file.
+
+    row(key):
+        Returns the row of the course with the given key.
+
+    course(row):
+        Returns a CourseView of the given row.
+
+    find_range(start, stop):
+        Generates the (key, course) pairs whose key is in a range.
+
+    column(name):
+        Returns a number column of the file.
+
+    total_benefit():
+        Calculates the total benefit of the courses.
+
+    close():
+        Closes the file.
+    """
+
+    MAGIC = b"ACAD"
+    VERSION = 2  # 2: keys are course_key (label, NUL and the lengths of the name and the level)
+    # Sections of the file, in order, with the type of their elements
+    # (offsets are positions in the string table; "strings" are the bytes of the table)
+    SECTIONS = (("key", "Q"), ("name", "Q"),
+                ("duration", "q"), ("number_students", "q"), ("price", "d"), ("benefit", "d"),
+                ("level", "I"), ("language", "I"), ("level_values", "Q"), ("language_values", "Q"),
+                ("strings", "B"))
+    HEADER = struct.Struct("<4sIBxxxQ" + "QQ" * len(SECTIONS)) # Magic, version, byte order, rows, (offset, size) of each section
+    BYTE_ORDER = {"little": 0, "big": 1}
+
+    @classmethod
+    def write(cls, academy, file_name: str):
+        """Writes the courses of a tree (or a CourseTable) in a binary file.
+
+        Parameters
+        ----------
+        academy: AVL or CourseTable
+            Courses of the academy.
+
+        file_name: str
+            Name of the file that is created.
+
+        Returns
+        -------
+        None.
+        """
+        table = academy if isinstance(academy, CourseTable) else CourseTable.from_academy(academy)
+        keys = list(table.index) # In increasing order
+        rows = [table.row(key) for key in keys]
+        strings = bytearray()
+
+        def add_strings(values):
+            """Adds the strings to the table and returns their offsets (one more than the strings)."""
+            offsets = array("Q", [len(strings)])
+            for value in values:
+                strings.extend(value.encode("utf-8"))
+                offsets.append(len(strings))
+            return offsets
+
+        names = table.column("name")
+        sections = {"key": add_strings(keys), "name": add_strings(names[row] for row in rows)}
+        for column in CourseTable.NUMBER_COLUMNS:
+            values = table.column(column)
+            sections[column] = array(values.typecode, (values[row] for row in rows))
+        for column in CourseTable.CATEGORY_COLUMNS:
+            values = table.column(column)
+            codes = {}
+            sections[column] = array("I", (codes.setdefault(values[row], len(codes)) for row in rows))
+            sections[column + "_values"] = add_strings(codes) # In the order of their codes
+        sections["strings"] = strings
+
+        header = [cls.MAGIC, cls.VERSION, cls.BYTE_ORDER[sys.byteorder], len(keys)]
+        blocks = []
+        position = cls.HEADER.size
+        for name, typecode in cls.SECTIONS:
+            data = bytes(sections[name])
+            padding = -position % 8 # Each section starts at a multiple of 8
+            blocks.append(b"\0" * padding + data)
+            position += padding
+            header.extend((position, len(data)))
+            position += len(data)
+        with open(file_name, "wb") as f:
+            f.write(cls.HEADER.pack(*header))
+            for block in blocks:
+                f.write(block)
+
+    def __init__(self, file_name: str):
+        """Opens a binary academy file (see write).
+
+        Parameters
+        ----------
+        file_name: str
+            Name of the file.
+
+        Returns
+        -------
+        None.
+        """
+        with open(file_name, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self.HEADER.unpack_from(self._map)
+        magic, version, byte_order, self._size = header[:4]
+        if magic != self.MAGIC or version != self.VERSION or byte_order != self.BYTE_ORDER[sys.byteorder]:
+            self._map.close()
+            raise ValueError("The file is not a binary academy file of this version and machine")
+        self._view = memoryview(self._map)
+        self._sections = {}
+        self._offsets = {} # Position of each section in the file
+        for i, (name, typecode) in enumerate(self.SECTIONS):
+            offset, size = header[4 + 2 * i], header[5 + 2 * i]
+            self._offsets[name] = offset
+            self._sections[name] = self._view[offset:offset + size].cast(typecode) # No copy is made
+
+    def close(self):
+        """Closes the file (the courses read from it can no longer be used)."""
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        """Returns the number of courses in the file."""
+        return self._size
+
+    def _string(self, column: str, i: int) -> str:
+        """Returns the string number i of a column of offsets."""
+        offsets = self._sections[column]
+        return str(self._sections["strings"][offsets[i]:offsets[i + 1]], "utf-8")
+
+    def _key_bytes(self, row: int) -> bytes:
+        """Returns the encoded key of a row, read directly from the mapped file."""
+        offsets = self._sections["key"]
+        start = self._offsets["strings"]
+        return self._map[start + offsets[row]:start + offsets[row + 1]]
+
+    def _bisect(self, key: str) -> int:
+        """Returns the first row whose key is not lower than 'key'.
+
+        The keys are compared as UTF-8 bytes, which keeps the order of the strings.
+        """
+        target = key.encode("utf-8")
+        low, high = 0, self._size
+        while low < high:
+            mid = (low + high) // 2
+            if self._key_bytes(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def row(self, key: str) -> int:
+        """Returns the row of the course with the given key (raise KeyError if not found)."""
+        row = self._bisect(key)
+        if row == self._size or self._key_bytes(row) != key.encode("utf-8"):
+            raise KeyError(key)
+        return row
+
+    def course(self, row: int) -> CourseView:
+        """Returns a CourseView that reads the course of the given row."""
+        return CourseView(self, row)
+
+    def __getitem__(self, key: str) -> CourseView:
+        """Returns a CourseView of the course with the given key (raise KeyError if not found)."""
+        return CourseView(self, self.row(key))
+
+    def __contains__(self, key) -> bool:
+        """Checks if there is a course with the given key."""
+        try:
+            self.row(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        """Generates the keys in increasing order."""
+        for row in range(self._size):
+            yield self._string("key", row)
+
+    def value(self, column: str, row: int):
+        """Returns the value of a column in the given row (it is used by CourseView)."""
+        if column == "name":
+            return self._string("name", row)
+        if column in CourseTable.CATEGORY_COLUMNS:
+            return self._string(column + "_values", self._sections[column][row])
+        return self._sections[column][row]
+
+    def find_range(self, start: str, stop: str):
+        """Generates the (key, course) pairs such that start <= key < stop, in increasing order of key.
+
+        Parameters
+        ----------
+        start: str
+            First key of the range. The range starts with the first course if it is None.
+
+        stop: str
+            Key after the range. The range continues through the last course if it is None.
+
+        Returns
+        -------
+        generator
+            Yields (key, CourseView) tuples.
+        """
+        low = self._bisect(start) if start is not None else 0
+        high = self._bisect(stop) if stop is not None else self._size
+        for row in range(low, high):
+            yield self._string("key", row), CourseView(self, row)
+
+    def column(self, name: str):
+        """Returns a number column of the file.
+
+        Parameters
+        ----------
+        name: str
+            duration, number_students, price or benefit.
+
+        Returns
+        -------
+        column: memoryview
+            Values of the column in increasing order of key, read from the mapped file.
+        """
+        return self._sections[name]
+
+    def total_benefit(self) -> float:
+        """Returns the sum of the benefits of all the courses."""
+        return sum(self._sections["benefit"])
@@ -0,0 +1,162 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+from course import Course
+from paquete.range_sum_tree import RangeSumAVL
+
+class AcademyStats:
+    """Class that keeps the statistics of a group of courses while courses are added and removed.
+
+    For each language and each level it stores the number of courses and the sum of their students,
+    and it stores the total benefit of all the courses. The statistics are answered
+    without going through the courses.
+
+    Attributes
+    ----------
+    None.
+
+    Methods
+    -------
+    add(course):
+        Adds the data of a course to the statistics.
+
+    remove(course):
+        Removes the data of a course from the statistics.
+
+    mean_students(group_column):
+        Returns the average number of students of each language or level.
+
+    total_benefit():
+        Returns the total benefit of the courses.
+    """
+
+    GROUP_COLUMNS = ("language", "level")
+
+    def __init__(self):
+        """Creates the statistics of an empty group of courses.
+
+        Returns
+        -------
+        None.
+        """
+        self._students = {column: {} for column in self.GROUP_COLUMNS} # Sum of students of each value
+        self._counts = {column: {} for column in self.GROUP_COLUMNS}   # Number of courses of each value
+        self._benefit = 0.0
+        self._error = 0.0 # Rounding error of self._benefit (compensated sum)
+
+    def _add_benefit(self, benefit: float):
+        """Adds a benefit (negative to remove it) to the total keeping its rounding error."""
+        total = self._benefit + benefit
+        if abs(self._benefit) >= abs(benefit):
+            self._error += (self._benefit - total) + benefit
+        else:
+            self._error += (benefit - total) + self._benefit
+        self._benefit = total
+
+    def add(self, course: Course):
+        """Adds the data of a course to the statistics.
+
+        Parameters
+        ----------
+        course: Course
+            Course that has been added to the academy.
+
+        Returns
+        -------
+        None.
+        """
+        for column in self.GROUP_COLUMNS:
+            value = getattr(course, column)
+            self._students[column][value] = self._students[column].get(value, 0) + course.number_students
+            self._counts[column][value] = self._counts[column].get(value, 0) + 1
+        self._add_benefit(course.benefit)
+
+    def remove(self, course: Course):
+        """Removes the data of a course from the statistics.
+
+        Parameters
+        ----------
+        course: Course
+            Course that has been removed from the academy.
+
+        Returns
+        -------
+        None.
+        """
+        for column in self.GROUP_COLUMNS:
+            value = getattr(course, column)
+            self._counts[column][value] -= 1
+            if self._counts[column][value] == 0: # There are no more courses with this value
+                del self._counts[column][value]
+                del self._students[column][value]
+            else:
+                self._students[column][value] -= course.number_students
+        self._add_benefit(-course.benefit)
+
+    def mean_students(self, group_column: str) -> dict:
+        """Returns the average number of students of each value of 'group_column'.
+
+        Parameters
+        ----------
+        group_column: str
+            language or level.
+
+        Returns
+        -------
+        means: dict
+            Average number of students of each language or level, ordered by its value.
+        """
+        counts = self._counts[group_column]
+        return {value: self._students[group_column][value] / counts[value] for value in sorted(counts)}
+
+    def total_benefit(self) -> float:
+        """Returns the total benefit of the courses."""
+        return self._benefit + self._error
+
+
+class AcademyAVL(RangeSumAVL):
+    """AVL tree of courses that keeps the statistics of its courses (see AcademyStats).
+
+    The statistics are updated when a course is inserted, deleted or replaced.
+    Any page of courses can be reached with select, and the benefit and the students
+    of a range of keys are summed with sum_range.
+    """
+
+    FIELDS = ("benefit", "number_students")
+
+    def __init__(self, fields=None):
+        """Create an initially empty tree that sums the attributes named in fields (FIELDS by default)."""
+        super().__init__(fields)
+        self._stats = AcademyStats()
+
+    @property
+    def stats(self):
+        """Returns the statistics of the courses of the tree."""
+        return self._stats
+
+    def _value_added(self, v):
+        self._stats.add(v)
+
+    def _value_removed(self, v):
+        self._stats.remove(v)
+
+    def sum_prefix(self, prefix: str, field: str):
+        """Returns the sum of 'field' of the courses whose label (and key) starts with 'prefix'.
+
+        Parameters
+        ----------
+        prefix: str
+            Beginning of the label of the courses (for example, the beginning of their name).
+
+        field: str
+            benefit or number_students.
+
+        Returns
+        -------
+        total: float or int
+            Sum of the field, calculated in O(log n) without going through the courses.
+        """
+        if prefix == "":
+            return self.sum_range(None, None, field)
+        stop = prefix[:-1] + chr(ord(prefix[-1]) + 1) # Lowest string greater than all the keys with the prefix
+        return self.sum_range(prefix, stop, field)
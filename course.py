@@ -1,12 +1,51 @@
 # Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
 # Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
 
+import sys
+
+def course_key(name: str, level: str, language: str) -> str:
+    """Returns the key of a course in the trees (see Course.key).
+
+    The key is the label of the course (name_level_language) followed by a NUL character
+    and the lengths of the name and the level, so two different courses never have the same
+    key even if their names contain "_", and the keys are in the same order as the labels.
+    The key is a plain string and it is interned, so equal keys are compared by identity;
+    the order comparisons of the trees still compare the whole label, as the labels did.
+    The fields cannot contain NUL, because label() cuts the key at the first one.
+
+    Parameters
+    ----------
+    name: str
+        Name of the course.
+
+    level: str
+        Level of the course.
+
+    language: str
+        Language of the course.
+
+    Returns
+    -------
+    key: str
+
+    Raises
+    ------
+    ValueError
+        If the name, the level or the language contain a NUL character.
+    """
+    if '\0' in name or '\0' in level or '\0' in language:
+        raise ValueError(f'The fields of a course cannot contain NUL: {name!r}, {level!r}, {language!r}')
+    return sys.intern(f'{name}_{level}_{language}\0{len(name)}\0{len(level)}')
+
 class Course:
     """Class that initializes the Course object. 
     
     Objects of this class represent courses of different languages and levels
     stored with their data regarding type, duration, price, and number of enrolled students.
 
+    The attributes are stored in slots (there is no __dict__ per course) and the
+    level and language strings are interned, so all the courses share one copy of each value.
+
     Attributes
     ----------
     name: str
@@ -31,6 +70,9 @@ class Course:
     benefit: float
         Total income obtained by the course (price * duration * number_students).
 
+    key: str
+        Key of the course in the trees (see course_key), computed when the course is created.
+
     Methods
     -------
     @property
@@ -67,13 +109,21 @@ class Course:
     ge_benefit(self, other_course: 'Course'):
         Method that returns a boolean value when comparing if the current course provides greater or equeal benefit than other_course.
 
+    key(self):
+        Method that returns the key of the course in the trees.
+
     label(self):
         Method that returns a string with the characteristics of the name, level, and language of the course.
 
+    __reduce__(self):
+        Method that allows pickling the course (the strings are interned again when it is loaded).
+
     __str__(self):
         Method that returns all the characteristics of the Course object in question.
     """ 
 
+    __slots__ = ('_name', '_duration', '_number_students', '_level', '_language', '_price', '_benefit', '_key')
+
     def __init__(self, name: str, duration: int, number_students: int, level: str, language: str, price: float):
         """Assigns the different attributes to the Course object.
  
@@ -105,10 +155,11 @@ class Course:
         self._name = name
         self._duration = duration
         self._number_students = number_students
-        self._level = level
-        self._language = language
+        self._level = sys.intern(level) # There are only a few different levels and languages
+        self._language = sys.intern(language)
         self._price = price
         self._benefit = self._price * self._duration * self._number_students
+        self._key = course_key(self._name, self._level, self._language)
 
     @property
     def name(self):
@@ -224,6 +275,16 @@ class Course:
         """
         return self._benefit >= other_course.benefit
     
+    def key(self):
+        """Returns the key of the course in the trees.
+
+        Returns
+        --------
+        str
+            Key that identifies the name, level, and language of the course (see course_key).
+        """
+        return self._key
+
     def label(self):
         """Returns a string with information collected about the current course.
 
@@ -232,7 +293,17 @@ class Course:
         str
             Returns the name, level, and language of the course in question.
         """
-        return f'{self._name}_{self._level}_{self._language}'
+        return self._key[:self._key.index('\0')]
+
+    def __reduce__(self):
+        """Returns the information needed to pickle the course.
+
+        Returns
+        --------
+        tuple
+            The course is created again from its parameters when it is loaded.
+        """
+        return (Course, (self._name, self._duration, self._number_students, self._level, self._language, self._price))
     
     def __str__(self):
         """Returns a string with all the information gathered about the current course.
@@ -0,0 +1,250 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+from array import array
+from course import Course, course_key
+from paquete.avl_tree import AVL
+from paquete.b_tree import BTree
+
+class CourseTable:
+    """Class that stores the courses of an academy by columns.
+
+    Each attribute of the courses is stored in its own column (a typed array for numbers),
+    so the statistics can be calculated from the columns without going through the courses.
+    The level and language columns store a code for each row and the list of different values.
+    The trees of the academies still store Course objects: a table is a columnar copy of
+    a tree (see from_academy), used to write the binary academy files (see AcademyFile).
+
+    Attributes
+    ----------
+    index: BTree
+        B+ tree that maps the key of each course (see Course.key) to its row in the table.
+
+    Methods
+    -------
+    from_academy(academy):
+        Creates a table with the courses of a tree.
+
+    add(course):
+        Adds a course to the table (or replaces the course with the same key).
+
+    row(key):
+        Returns the row of the course with the given key.
+
+    course(row):
+        Returns a CourseView of the given row.
+
+    column(name):
+        Returns a column of the table.
+
+    group_mean(group_column, target_column):
+        Calculates the mean of a column grouped by the values of another one.
+
+    total_benefit():
+        Calculates the total benefit of the courses.
+    """
+
+    NUMBER_COLUMNS = ("duration", "number_students", "price", "benefit")
+    CATEGORY_COLUMNS = ("level", "language")
+
+    def __init__(self):
+        """Creates an empty table.
+
+        Returns
+        -------
+        None.
+        """
+        self._index = BTree()
+        self._columns = {"name": [],
+                         "duration": array("q"), "number_students": array("q"),
+                         "price": array("d"), "benefit": array("d"),
+                         "level": array("I"), "language": array("I")}
+        self._values = {name: [] for name in self.CATEGORY_COLUMNS} # Different values of each category
+        self._codes = {name: {} for name in self.CATEGORY_COLUMNS}  # Code of each value
+
+    @classmethod
+    def from_academy(cls, academy: AVL) -> 'CourseTable':
+        """Creates a table with the courses of a tree, in the order of their keys.
+
+        Parameters
+        ----------
+        academy: AVL
+            Tree with the courses of an academy.
+
+        Returns
+        -------
+        table: CourseTable
+        """
+        table = cls()
+        keys = []
+        for key, course in academy.items():
+            table._append(course)
+            keys.append((key, len(keys)))
+        table._index = BTree.from_sorted(keys)
+        return table
+
+    def __len__(self):
+        """Returns the number of courses in the table."""
+        return len(self._columns["name"])
+
+    def _code(self, column: str, value: str) -> int:
+        """Returns the code of a value of a category column (a new one if it is not found)."""
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(self._values[column])
+            self._values[column].append(value)
+        return codes[value]
+
+    def _append(self, course: Course):
+        """Adds the data of a course in a new row at the end of the columns."""
+        self._columns["name"].append(course.name)
+        for column in self.NUMBER_COLUMNS:
+            self._columns[column].append(getattr(course, column))
+        for column in self.CATEGORY_COLUMNS:
+            self._columns[column].append(self._code(column, getattr(course, column)))
+
+    def add(self, course: Course) -> int:
+        """Adds a course to the table. If there is a course with the same key, its row is replaced.
+
+        Parameters
+        ----------
+        course: Course
+            Course to be added.
+
+        Returns
+        -------
+        row: int
+            Row of the course in the table.
+        """
+        key = course.key()
+        row = self._index.get(key)
+        if row is None: # New course
+            row = len(self)
+            self._append(course)
+            self._index[key] = row
+        else:
+            self._columns["name"][row] = course.name
+            for column in self.NUMBER_COLUMNS:
+                self._columns[column][row] = getattr(course, column)
+            for column in self.CATEGORY_COLUMNS:
+                self._columns[column][row] = self._code(column, getattr(course, column))
+        return row
+
+    @property
+    def index(self):
+        """Returns the tree that maps each key to its row."""
+        return self._index
+
+    def row(self, key) -> int:
+        """Returns the row of the course with the given key (raise KeyError if not found)."""
+        return self._index[key]
+
+    def course(self, row: int) -> 'CourseView':
+        """Returns a CourseView that reads the course of the given row."""
+        return CourseView(self, row)
+
+    def __getitem__(self, key) -> 'CourseView':
+        """Returns a CourseView of the course with the given key (raise KeyError if not found)."""
+        return CourseView(self, self._index[key])
+
+    def value(self, column: str, row: int):
+        """Returns the value of a column in the given row."""
+        value = self._columns[column][row]
+        if column in self.CATEGORY_COLUMNS:
+            value = self._values[column][value]
+        return value
+
+    def column(self, name: str):
+        """Returns a column of the table.
+
+        Parameters
+        ----------
+        name: str
+            Name of the column (name, duration, number_students, level, language, price or benefit).
+
+        Returns
+        -------
+        column: array or list
+            The numbers are returned in the array itself (it must not be modified).
+            The names, levels and languages are returned in a list.
+        """
+        if name in self.CATEGORY_COLUMNS:
+            values = self._values[name]
+            return [values[code] for code in self._columns[name]]
+        return self._columns[name]
+
+    def group_mean(self, group_column: str, target_column: str) -> dict:
+        """Calculates the mean of a number column grouped by the values of a category column.
+
+        Parameters
+        ----------
+        group_column: str
+            level or language.
+
+        target_column: str
+            Name of a number column.
+
+        Returns
+        -------
+        means: dict
+            Mean of the target column for each value of the group column.
+        """
+        sums = [0] * len(self._values[group_column])
+        counts = [0] * len(self._values[group_column])
+        for code, value in zip(self._columns[group_column], self._columns[target_column]):
+            sums[code] += value
+            counts[code] += 1
+        return {value: sums[code] / counts[code]
+                for code, value in enumerate(self._values[group_column]) if counts[code] > 0}
+
+    def total_benefit(self) -> float:
+        """Returns the sum of the benefits of all the courses."""
+        return sum(self._columns["benefit"])
+
+
+class CourseView(Course):
+    """Course that reads its data from a row of a CourseTable instead of storing it.
+
+    It has the same methods as Course, but it does not store a copy of the data.
+    """
+
+    _name = property(lambda self: self._table.value("name", self._row))
+    _duration = property(lambda self: self._table.value("duration", self._row))
+    _number_students = property(lambda self: self._table.value("number_students", self._row))
+    _level = property(lambda self: self._table.value("level", self._row))
+    _language = property(lambda self: self._table.value("language", self._row))
+    _price = property(lambda self: self._table.value("price", self._row))
+    _benefit = property(lambda self: self._table.value("benefit", self._row))
+
+    __slots__ = ('_table', '_row', '_cached_key')
+
+    @property
+    def _key(self):
+        """Returns the key of the course, computed from the row only the first time."""
+        if self._cached_key is None:
+            self._cached_key = course_key(self._name, self._level, self._language)
+        return self._cached_key
+
+    def __init__(self, table: CourseTable, row: int):
+        """Creates a view of a row of the table.
+
+        Parameters
+        ----------
+        table: CourseTable
+            Table where the course is stored.
+
+        row: int
+            Row of the course in the table.
+
+        Returns
+        -------
+        None.
+        """
+        self._table = table
+        self._row = row
+        self._cached_key = None
+
+    @property
+    def row(self):
+        """Returns the row of the table that the view reads."""
+        return self._row
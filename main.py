@@ -1,10 +1,26 @@
 # Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
 # Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
 
+from academy_stats import AcademyAVL
 from course import Course
+from name_index import NameIndex
 from paquete.avl_tree import AVL
+from heapq import merge
+from itertools import groupby, islice
+from concurrent.futures import ProcessPoolExecutor
+import io
+import locale
+import mmap
+import os
 import pandas
 
+# If one academy has SKEW_RATIO times more courses than the other one,
+# the common courses are searched from the smallest one (see common_pairs)
+SKEW_RATIO = 8
+
+# Number of bytes read from a course file at a time (see read_file)
+READ_BUFFER_SIZE = 1024 * 1024
+
 class CourseSimulator:
     """Class that prepares the environment for handling Course objects.
 
@@ -16,10 +32,137 @@ class CourseSimulator:
 
     Methods
     -------
+    parse_line(line):
+        Separates a line of the file into parameters separated by the "," character and creates a course.
+
+    parse_lines(lines, header):
+        Generates the courses of the lines of a file, one by one.
+
+    load(lines):
+        Creates a tree with the courses of the lines of a file.
+
+    load_parallel(file_name, workers):
+        Creates a tree with the courses of a file, parsing parts of it in several processes.
+
     parse_file(text):
         Splits each line of the file (text) and separates it into parameters separated by the "," character.
     """
 
+    def parse_line(self, line: str) -> Course:
+        """Divides a line into parameters of a Course object.
+
+        Parameters
+        ----------
+        line: str
+            A line of the given file.
+
+        Returns
+        -------
+        course: Course
+            Course with the data of the line.
+        """
+        parts = line.rstrip("\n").split(",") 
+        name = parts[0]
+        duration = int(parts[1])
+        n_students = int(parts[2])
+        level = parts[3]
+        language = parts[4]
+        price = float(parts[5])
+
+        # Instantiates a course object with the read data
+        return Course(name, duration, n_students, level, language, price)
+
+    def parse_lines(self, lines, header: bool = True):
+        """Generates the courses of the given lines as they are read.
+
+        Parameters
+        ----------
+        lines: iterable
+            Lines of the given file (for example, the opened file itself).
+            Empty lines are ignored.
+
+        header: bool
+            True if the first line does not contain valid data (the beginning of the file).
+
+        Returns
+        -------
+        generator
+            Yields a Course object for each line.
+        """
+        lines = iter(lines)
+        if header:
+            next(lines, None) # The first line does not contain valid data.
+        for line in lines:
+            if line.strip(): 
+                yield self.parse_line(line)
+
+    def load(self, lines):
+        """Creates a tree with the courses of the given lines.
+
+        Only the courses are kept in memory, not the lines that have already been read.
+
+        Parameters
+        ----------
+        lines: iterable
+            Lines of the given file (for example, the opened file itself).
+
+        Returns
+        -------
+        academy: AVL
+            It is an AVL tree that stores each course with its specific characteristics.
+        """
+        courses = ((course.key(), course) for course in self.parse_lines(lines))
+        # Creates the AVL tree at once. If a course is repeated, the last one is kept
+        academy = AcademyAVL.from_sorted(courses, sort=True)
+        return academy
+
+    def load_parallel(self, file_name: str, workers: int = None):
+        """Creates a tree with the courses of a file, parsing parts of it in several processes.
+
+        The file is divided into parts that end at the end of a line. Each process parses
+        one part into a list of courses ordered by key (see parse_part) and the lists are
+        merged at the end. The result is the same as with load: if a course is repeated,
+        the last one of the file is kept.
+
+        Parameters
+        ----------
+        file_name: str
+            Name of the file to read (with its extension).
+
+        workers: int
+            Number of processes. By default, the number of processors.
+
+        Returns
+        -------
+        academy: AVL
+            It is an AVL tree that stores each course with its specific characteristics.
+        """
+        workers = workers or os.cpu_count() or 1
+        encoding = locale.getpreferredencoding(False) # The same as open(file_name)
+        with open(file_name, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            starts = [0]
+            if size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    for i in range(1, workers):
+                        # Each part starts after the end of a line
+                        start = data.find(b"\n", max(size * i // workers, starts[-1])) + 1
+                        if start == 0: # There are no more lines
+                            break
+                        if start > starts[-1]:
+                            starts.append(start)
+        ends = starts[1:] + [size]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(parse_part, [file_name] * len(starts), starts, ends,
+                                      [i == 0 for i in range(len(starts))], [encoding] * len(starts)))
+
+        courses = [] # (key, course) pairs of all the parts, in order
+        for key, group in groupby(merge(*[tagged_items(i, part) for i, part in enumerate(parts)]), key=lambda item: item[0]):
+            courses.append((key, list(group)[-1][2])) # The course of the last part is kept
+        academy = AcademyAVL.from_sorted(courses)
+        return academy
+
     def parse_file(self, text: str):
         """Divides the given text into parameters of a Course object.
 
@@ -33,33 +176,61 @@ class CourseSimulator:
         academy: AVL
             It is an AVL tree that stores each course with its specific characteristics.
         """
+        return self.load(text.split("\n"))
+    
+def parse_part(file_name: str, start: int, end: int, header: bool, encoding: str) -> list:
+    """Parses the lines between two positions of a file (used by CourseSimulator.load_parallel).
 
-        lines = text.split("\n") 
-        academy = AVL() # Creates an empty AVL tree 
-        
-        for line in lines[1:]: # The first line does not contain valid data.
-            parts = line.split(",") 
-            name = parts[0]
-            duration = int(parts[1])
-            n_students = int(parts[2])
-            level = parts[3]
-            language = parts[4]
-            price = float(parts[5])
-
-            # Instantiates a course object with the read data and adds it to the AVL
-            course = Course(name, duration, n_students, level, language, price)
-            academy[course.label()] = course
+    Parameters
+    ----------
+    file_name: str
+        Name of the file to read (with its extension).
 
-        return academy
-    
-def read_file(name):
+    start: int
+        Position (in bytes) of the first line of the part.
+
+    end: int
+        Position (in bytes) after the last line of the part.
+
+    header: bool
+        True if the part is the beginning of the file.
+
+    encoding: str
+        Encoding of the file.
+
+    Returns
+    -------
+    courses: list
+        List of (key, course) tuples ordered by key. If a course is repeated, the last one is kept.
+    """
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    simulator = CourseSimulator()
+    courses = {}
+    # The lines are separated as when the file is opened in text mode
+    for course in simulator.parse_lines(io.StringIO(text, newline=None), header):
+        courses[course.key()] = course
+    return sorted(courses.items(), key=lambda item: item[0])
+
+def read_file(name, buffer_size: int = READ_BUFFER_SIZE, workers: int = None):
     """Reads the given file.
 
+    The file is read line by line, so the whole text is never stored in memory.
+    If a number of workers is given, parts of the file are parsed in several processes.
+
     Parameters
     ----------
     name: str
         Name of the file to read.
 
+    buffer_size: int
+        Number of bytes that are read from the file at a time.
+
+    workers: int
+        Number of processes used to parse the file (see CourseSimulator.load_parallel).
+        If it is None, the file is parsed in the current process.
+
     Returns
     -------
     academy: AVL
@@ -69,15 +240,16 @@ def read_file(name):
 
     file_name = name + ".txt"
     try:
-        with open(file_name) as f:
-            courses_text = f.read()
-            simulator = CourseSimulator()
-            academy = simulator.parse_file(courses_text)
+        simulator = CourseSimulator()
+        if workers is not None:
+            academy = simulator.load_parallel(file_name, workers)
+        else:
+            with open(file_name, buffering=buffer_size) as f:
+                academy = simulator.load(f)
     except: # An error may occur if the name given does not correspond to any file in the current directory
         print("The file could not be read.\n")
         return None
     else:
-        f.close()
         print("File read succesfully.\n")
         return academy
     
@@ -140,14 +312,9 @@ def search(tree: AVL, position, key):
         Returns the position corresponding to the key value.
         If the key is not found, returns None.
     """
-    if position is None: # Has reached a leaf node and has not found the key
+    if position is None: # Empty subtree
         return None
-    elif key == position.key(): # The key is in the root node
-        return position
-    elif key < position.key(): # If the key is lower, looks in the left
-        return search(tree, tree.left(position), key)
-    else: # If the key is greater, searches in the right
-        return search(tree, tree.right(position), key)
+    return tree.find_key(key, position) # Goes down comparing the keys of the nodes without recursion
 
 def common_course(tree_A: AVL, tree_B: AVL, key_A, key_B):
     """Combines two identical courses in one course.
@@ -175,6 +342,24 @@ def common_course(tree_A: AVL, tree_B: AVL, key_A, key_B):
 
     course_A = tree_A[key_A] # Returns a course object
     course_B = tree_B[key_B] 
+    return combine_courses(course_A, course_B)
+
+def combine_courses(course_A: Course, course_B: Course) -> Course:
+    """Combines two identical courses in one course.
+
+    Parameters
+    ----------
+    course_A: Course
+        Course of academy A.
+
+    course_B: Course
+        Same course in academy B.
+
+    Returns
+    -------
+    new_course: Course()
+
+    Creates a new course from the most profitable one by combining the students."""
     # The number of students is added
     n_students = course_A.number_students + course_B.number_students
     # Checks which course is more profitable.
@@ -187,6 +372,40 @@ def common_course(tree_A: AVL, tree_B: AVL, key_A, key_B):
         new_course = Course(course_B.name, course_B.duration, n_students, course_B.level, course_B.language, course_B.price)
     return new_course
 
+def common_pairs(tree_A: AVL, tree_B: AVL):
+    """Generates the courses that have the same key in both trees, in order.
+
+    If the sizes are similar, both trees are walked at the same time (merge_join).
+    If one of them is much smaller, only its keys are searched in the other tree
+    with get_many, which starts each search from the node of the previous key.
+
+    Parameters
+    ----------
+    tree_A: AVL(BST)
+        Tree representing academy A.
+
+    tree_B: AVL(BST)
+        Tree representing academy B.
+
+    Returns
+    -------
+    generator
+        Yields tuples (key, course_A, course_B) in increasing order of key.
+    """
+    if len(tree_A) * SKEW_RATIO < len(tree_B) or len(tree_B) * SKEW_RATIO < len(tree_A):
+        small, large = (tree_A, tree_B) if len(tree_A) < len(tree_B) else (tree_B, tree_A)
+        keys = list(small) # In increasing order
+        for key, course, found in zip(keys, small.values(), large.get_many(keys)):
+            if found is not None:
+                if small is tree_A:
+                    yield key, course, found
+                else:
+                    yield key, found, course
+    else:
+        for key, course_A, course_B in merge_join(tree_A, tree_B):
+            if course_A is not None and course_B is not None:
+                yield key, course_A, course_B
+
 def common_offer(tree_A: AVL, tree_B: AVL) -> AVL:
     """Creates a common tree with the courses present in both academies (tree_A and tree_B).
     
@@ -205,21 +424,15 @@ def common_offer(tree_A: AVL, tree_B: AVL) -> AVL:
     Creates a tree for a new academy C (that includes courses from A and B) representing the 
     'common offer', adding only the common courses between A and B."""
 
-    common_tree = AVL() # Creates an empty tree (equivalent to academy C)
-    for key_A in iter(tree_A): # Go through the courses of academy A
-        # Since we have used a name_level_language type key, 
-        # the same course in 2 trees will have the same key 
-        # and we can do an efficient search in the other tree.
-        aux = search(tree_B, tree_B.root(), key_A) # look for the same course at Academy B
-        # aux is the position where the course is
-        # If aux is None it has not been found, if not it is in the root
-        if aux is not None:
-            new_course = common_course(tree_A, tree_B, key_A, aux.key())
-            common_tree[new_course.label()] = new_course
-    # It is not necessary to go through the courses of academy B 
-    return common_tree
-
-def add_courses(tree_A: AVL, tree_B: AVL, tree_C: AVL, key_A: str, academy_name: str):
+    # Since the key identifies the name, level and language (see Course.key),
+    # the same course in 2 trees will have the same key.
+    common_courses = [] # The common courses are found in order
+    for key, course_A, course_B in common_pairs(tree_A, tree_B):
+        new_course = combine_courses(course_A, course_B)
+        common_courses.append((new_course.key(), new_course))
+    return AcademyAVL.from_sorted(common_courses) # Creates the tree (equivalent to academy C)
+
+def add_courses(tree_A: AVL, tree_B: AVL, tree_C: AVL, key_A: str, academy_name: str, names_B: NameIndex = None):
     """
     Searches a course from tree_A with 'key_A' as key in tree_B and adds it to tree_C.
     
@@ -234,11 +447,11 @@ def add_courses(tree_A: AVL, tree_B: AVL, tree_C: AVL, key_A: str, academy_name:
 
     tree_B: AVL(BST)
         Tree representing academy B.
-        Tree whose courses will be iterated in order to find a course with the same 
+        Tree whose courses will be searched by name in order to find a course with the same 
         name as the course in tree_A.
 
-    tree_C: AVL(BST)
-        Tree representing academy C in which the courses will be added.
+    tree_C: AVL(BST) or dict
+        Tree (or dictionary) representing academy C in which the courses will be added.
 
     key_A: str
         Key corresponding to the course in tree_A that will be searched in tree_B and
@@ -247,23 +460,80 @@ def add_courses(tree_A: AVL, tree_B: AVL, tree_C: AVL, key_A: str, academy_name:
     academy_name: str
         Name of the academy that tree_A represents.
 
+    names_B: NameIndex
+        Index by name of the courses of tree_B. It is created if it is not given.
+        If tree_B is tree_C, the index is updated with the added course.
+
     Returns
     -------
     None.
 
     Precondition: course corresponding to key_A in tree_A does not exist in tree_B
     """
-    existing_course = False # To know if a course with the same name has been found.
-    # existing_course will remain as False if it has not been found when the loop ends.
-    for key_B in iter(tree_B): # All courses of academy B
-        # If they have the same name but are not the same course
-        if (tree_A[key_A].name == tree_B[key_B].name[:len(tree_A[key_A].name)]) and not (tree_A[key_A] == tree_B[key_B]):
-            existing_course = True
-            course_A = tree_A[key_A]
-            new_course = Course(course_A.name + " " + academy_name, course_A.duration, course_A.number_students, course_A.level, course_A.language, course_A.price)
-            tree_C[new_course.label()] = new_course
-    if not existing_course: # The course is not in tree_B
-        tree_C[key_A] = tree_A[key_A]
+    if names_B is None:
+        names_B = NameIndex(tree_B)
+    course_A = tree_A[key_A]
+    # If they have the same name but are not the same course
+    if names_B.name_collision(course_A):
+        course_A = renamed_course(course_A, academy_name)
+        key_A = course_A.key()
+    # In other case the course is not in tree_B and it is added without modifications
+    tree_C[key_A] = course_A
+    if tree_B is tree_C: # The new course will be compared with the next ones
+        names_B.add(course_A)
+
+def renamed_course(course: Course, academy_name: str) -> Course:
+    """Creates a copy of 'course' with the name of the academy added to its name.
+
+    Parameters
+    ----------
+    course: Course
+        Course to be renamed.
+
+    academy_name: str
+        Name of the academy the course belongs to.
+
+    Returns
+    -------
+    new_course: Course
+    """
+    return Course(course.name + " " + academy_name, course.duration, course.number_students, course.level, course.language, course.price)
+
+def merge_join(tree_A: AVL, tree_B: AVL):
+    """Goes through the courses of both trees at the same time, following the order of their keys.
+
+    Since both trees iterate their keys in order, each key is compared only once
+    with the current key of the other tree (merge of two sorted sequences).
+
+    Parameters
+    ----------
+    tree_A: AVL(BST)
+        Tree representing academy A.
+
+    tree_B: AVL(BST)
+        Tree representing academy B.
+
+    Returns
+    -------
+    generator
+        Yields tuples (key, course_A, course_B) in increasing order of key.
+        course_A is None if the key is only in tree_B and course_B is None if the key is only in tree_A.
+    """
+    items_A = iter(tree_A.items()) # (key, course) pairs in order
+    items_B = iter(tree_B.items())
+    item_A = next(items_A, None)
+    item_B = next(items_B, None)
+    while item_A is not None or item_B is not None:
+        if item_B is None or (item_A is not None and item_A[0] < item_B[0]): # Only in academy A
+            yield item_A[0], item_A[1], None
+            item_A = next(items_A, None)
+        elif item_A is None or item_B[0] < item_A[0]: # Only in academy B
+            yield item_B[0], None, item_B[1]
+            item_B = next(items_B, None)
+        else: # Same key in both academies
+            yield item_A[0], item_A[1], item_B[1]
+            item_A = next(items_A, None)
+            item_B = next(items_B, None)
 
 def added_offer(tree_A: AVL, tree_B: AVL, academy_names: tuple) -> AVL:
     """Creates an 'added_tree' with the courses of both academies.
@@ -292,34 +562,187 @@ def added_offer(tree_A: AVL, tree_B: AVL, academy_names: tuple) -> AVL:
 
     Creates a tree for a new academy C (that includes A and B) representing the 
     courses of both academies.
+    Both trees are merged in a single pass (see merge_join).
     """
-    added_tree = AVL() # Creates an empty tree (equivalent to academy C)
-    for key_A in iter(tree_A): # Go through the courses of academy A
-        # If an equal course is found, the most profitable is added       
-        aux = search(tree_B, tree_B.root(), key_A)
-        if aux is not None: # aux is different from none if it has been found
-            new_course = common_course(tree_A, tree_B, key_A, aux.key())
-            added_tree[new_course.label()] = new_course
+    added = {} # Courses of academy C by key, the tree is created at the end
+    names_B = NameIndex(tree_B) # To find the courses of B with the same name
+    keys_B = [] # Keys of the courses that are only in academy B, in order
+
+    for key, course_A, course_B in merge_join(tree_A, tree_B):
+        if course_A is None: # Only in academy B, it is added after all the courses of A
+            keys_B.append(key)
+        elif course_B is not None: # If an equal course is found, the most profitable is added
+            new_course = combine_courses(course_A, course_B)
+            added[new_course.key()] = new_course
         else: # Adds courses with same name and courses that are not in tree B
-            add_courses(tree_A, tree_B, added_tree, key_A, academy_names[0])
-    
-    for key_B in iter(tree_B): # Go through the courses of academy B
-        # Look for an equal course in added_tree
-        # If found, it already exists so nothing is done
-        aux = search(added_tree, added_tree.root(), key_B)
-        if aux is None: # Adds courses with same name and courses that are not in tree C
-            add_courses(tree_B, added_tree, added_tree, key_B, academy_names[1])
-        
+            add_courses(tree_A, tree_B, added, key, academy_names[0], names_B)
+
+    # The courses of B are compared with the courses already added
+    names_C = NameIndex(added)
+    for key in keys_B:
+        # If an equal course is found in academy C, it already exists so nothing is done
+        if key not in added: # Adds courses with same name and courses that are not in academy C
+            add_courses(tree_B, added, added, key, academy_names[1], names_C)
+
+    added_tree = AcademyAVL.from_sorted(added.items(), sort=True) # Creates the tree (equivalent to academy C)
     return added_tree
 
-def show_courses(tree: AVL):
-    """Displays the courses stored in 'tree'.
+def tagged_items(i: int, items):
+    """Generates (key, i, value) tuples from (key, value) pairs, to merge them with heapq.merge.
+
+    Since the keys of each sequence are different, two tuples are never equal,
+    so the values are never compared.
+
+    Parameters
+    ----------
+    i: int
+        Number of the sequence.
+
+    items: iterable
+        (key, value) pairs in increasing order of key.
+
+    Returns
+    -------
+    generator
+    """
+    for key, value in items:
+        yield key, i, value
+
+def merge_many(trees: list):
+    """Goes through the courses of several trees at the same time, following the order of their keys.
+
+    The sorted keys of all the trees are merged with a heap, so each step takes O(log k)
+    for k trees.
+
+    Parameters
+    ----------
+    trees: list
+        List of AVL trees, each one representing an academy.
+
+    Returns
+    -------
+    generator
+        Yields tuples (key, courses) in increasing order of key, where courses is a list of
+        (i, course) tuples with the position i of each tree that has the key.
+    """
+    streams = [tagged_items(i, tree.items()) for i, tree in enumerate(trees)]
+    for key, group in groupby(merge(*streams), key=lambda item: item[0]):
+        yield key, [(i, course) for _, i, course in group]
+
+def combine_many(courses: list) -> Course:
+    """Combines several identical courses in one course (as combine_courses does with two).
+
+    Parameters
+    ----------
+    courses: list
+        List of equal Course objects, one of each academy.
+
+    Returns
+    -------
+    new_course: Course()
+
+    Creates a new course from the most profitable one (the first one in case of a tie)
+    by combining the students."""
+    best = courses[0]
+    for course in courses[1:]:
+        if not best.ge_benefit(course):
+            best = course
+    n_students = sum(course.number_students for course in courses)
+    return Course(best.name, best.duration, n_students, best.level, best.language, best.price)
+
+def common_offer_many(trees: list) -> AVL:
+    """Creates a common tree with the courses present in all the academies.
+
+    Parameters
+    ----------
+    trees: list
+        List of AVL trees, each one representing an academy.
+
+    Returns
+    -------
+    common_tree: AVL(BST)
+
+    Creates a tree with the courses that are in every academy, combined as in common_offer.
+    The keys of all the trees are merged at the same time (see merge_many)."""
+    common_courses = []
+    for key, courses in merge_many(trees):
+        if len(courses) == len(trees): # The course is in all the academies
+            new_course = combine_many([course for _, course in courses])
+            common_courses.append((new_course.key(), new_course))
+    return AcademyAVL.from_sorted(common_courses)
+
+def added_offer_many(trees: list, academy_names: tuple) -> AVL:
+    """Creates an 'added_tree' with the courses of all the academies.
+
+    In case of equal courses, they are combined as in common_offer_many.
+
+    In case a course is only in one academy and has the same name as another course
+    (as in add_courses), the name of its academy is added. The courses are compared
+    as in added_offer, in the order of the academies: the courses of the first academy
+    with the courses of all the other academies, and the courses of each following academy
+    with the courses already added (including the renamed ones and its own ones).
+
+    In other case, the course is added to the tree without modifications. 
+
+    With two academies the result is the one of added_offer, and academies without
+    courses (other than the first one) do not change the result.
+
+    Parameters
+    ----------
+    trees: list
+        List of AVL trees, each one representing an academy.
+
+    academy_names: tuple
+        Names of the academies, in the same order as trees.
+
+    Returns
+    -------
+    added_tree: AVL(BST)
+
+    Creates a tree for a new academy that includes the courses of all the academies.
+    The keys of all the trees are merged at the same time (see merge_many).
+    """
+    merged = list(merge_many(trees)) # (key, courses) of all the academies, in order
+    # Courses of the academies after the first one, to find the courses of the first one with the same name
+    others = {key: courses[-1][1] for key, courses in merged if courses[-1][0] != 0}
+    names_others = NameIndex(others)
+    added = {} # Courses of the new academy by key, the tree is created at the end
+    keys = [[] for _ in trees] # Keys of the courses that are only in each academy, in order
+
+    for key, courses in merged:
+        if len(courses) > 1: # The course is in several academies
+            new_course = combine_many([course for _, course in courses])
+            added[new_course.key()] = new_course
+        elif courses[0][0] == 0: # Only in the first academy
+            add_courses(trees[0], others, added, key, academy_names[0], names_others)
+        else: # It is added after all the courses of the first academy
+            keys[courses[0][0]].append(key)
+
+    # The courses of the other academies are compared with the courses already added
+    names_added = NameIndex(added)
+    for i in range(1, len(trees)):
+        for key in keys[i]:
+            # If an equal course is already in the new academy, nothing is done
+            if key not in added:
+                add_courses(trees[i], added, added, key, academy_names[i], names_added)
+
+    return AcademyAVL.from_sorted(added.items(), sort=True)
+
+def show_courses(tree: AcademyAVL, first: int = 0, count: int = None):
+    """Displays the courses stored in 'tree', or a page of them.
 
     Parameters
     ----------
-    tree: AVL(BST)
+    tree: AcademyAVL
         Tree in which the courses are stored.
 
+    first: int
+        Position (in key order, starting from 0) of the first course to display.
+        It is reached directly with tree.select.
+
+    count: int
+        Maximum number of courses to display. All of them if it is None.
+
     Returns
     -------
     None.
@@ -327,8 +750,10 @@ def show_courses(tree: AVL):
     print("-"*63)
     print("Key, name, duration, number of students, level, language, price")
     print("-"*63)
-    for course_key in iter(tree):
-        print(f"{course_key}, {tree[course_key]}")
+    if 0 <= first < len(tree):
+        start = tree.select(first).key() # Key of the first course of the page
+        for key, course in islice(tree.find_range(start, None), count):
+            print(f"{course.label()}, {course}")
     print()
 
 def show_menu(OPTIONS: tuple, MENU_OP: tuple):
@@ -378,15 +803,46 @@ def select_option(OPTIONS: list) -> int:
         print()
     return n
 
+def group_data(tree: AcademyAVL, group_attribute: str, group_column: str, target_column: str):
+    """Creates a DataFrame with the average number of students of a tree grouped by 'group_attribute'.
+
+    The averages are taken from the statistics that the tree keeps updated,
+    so the courses of the tree are not visited.
+
+    Parameters
+    ----------
+    tree: AcademyAVL
+        Tree of an academy.
+
+    group_attribute: str
+        Attribute of the courses used to group them ('language' or 'level').
+
+    group_column: str
+        Header of the column of the groups.
+
+    target_column: str
+        Header of the column of the average number of students.
+
+    Returns
+    -------
+    data: DataFrame
+        Table with the mean of 'target_column' for each value of 'group_column'.
+    """
+    means = tree.stats.mean_students(group_attribute)
+    data = pandas.DataFrame({(target_column, "mean"): list(means.values())},
+                            index=pandas.Index(list(means.keys()), name=group_column))
+    return data
+
 def show_data(data, group_column: str, target_column: str, academy_name: str):
     """Shows a statistics table that informs of the mean of 'target_variable' grouped by 'group_column'.
     
     Parameters
     ----------
     data: DataFrame
+        Table created by group_data.
 
     group_column: str
-        Parameter the data will be grouped by.
+        Parameter the data is grouped by.
         Identifies a constant variable. 
         
     target_column: str
@@ -399,53 +855,20 @@ def show_data(data, group_column: str, target_column: str, academy_name: str):
     -------
     None.
     """
-    data = data.groupby(group_column).agg({target_column:["mean"]})
     print ("-"*63)
     print (f" {target_column} grouped by {group_column} ({academy_name})")
     print ("-"*63, "\n")
     print (data, "\n")
             
-def tree_data(tree: AVL, column_1: str, column_2: str, column_3: str):
-    """Stores the courses' data of a given tree in a DataFrame.
-    
-    Parameters
-    ----------
-    tree: AVL
-        An AVL tree which data will be stored in a DataFrame.
-
-    column_1: str
-        Header of the column corresponding to the data stored in the first position of 'info_list'.
-        It will represent the 'language' atribute of each course of the tree.
-
-    column_2: str
-        Header of the column corresponding to the data stored in the second position of 'info_list'.
-        It will represent the 'number_students' atribute of each course of the tree.
-
-    column_3: str
-        Header of the column corresponding to the data stored in the third position of 'info_list'.
-        It will represent the 'level' atribute of each course of the tree.
-
-    Returns
-    -------
-    data: DataFrame
-        DataFrame organising the given data of the simulation.
-    """
-    info_list = [] # list in which the information will be stored
-    for key in iter(tree):
-        info_list.append([tree[key].language, tree[key].number_students, tree[key].level])
-    
-    # create a dataframe from the pandas library
-    data = pandas.DataFrame(info_list, columns=[column_1, column_2, column_3])
-    return data
+def total_benefit(tree: AcademyAVL, tree_name: str):
+    """Shows the total income of the academy that the tree represents.
 
-def total_benefit(tree: AVL, tree_name: str):
-    """Stores the benefit of each course of 'tree' in a pandas Series and
-    calculates the total income of the academy that the tree represents.
+    The total is taken from the statistics that the tree keeps updated.
     
     Parameters
     ----------
-    tree: AVL(BST)
-        Tree which total income will be calculated.
+    tree: AcademyAVL
+        Tree which total income will be shown.
 
     tree_name: str
         Name of the academy that the tree represents. 
@@ -454,12 +877,7 @@ def total_benefit(tree: AVL, tree_name: str):
     -------
     None.
     """
-    benefits = []
-    for key in iter(tree):
-        benefits.append(tree[key].benefit)
-    # creates a series from the pandas library
-    s = pandas.Series(benefits, dtype='float')
-    print(f"{tree_name}: {s.sum()} € \n")
+    print(f"{tree_name}: {tree.stats.total_benefit()} € \n")
     
 def main():
     """Internal structure of the menu that assigns each option its functions
@@ -502,7 +920,6 @@ def main():
             academy_b = file("second")
             # initializes the trees
             added_tree = common_tree = None
-            trees_data = [] # initializes data list
 
         elif main_op == OPTIONS[2]: # Perform the 'added offer' operation and view the result
             print(f"You selected:{MAIN_MENU_OP[2]}\n")
@@ -529,21 +946,18 @@ def main():
             elif added_tree == None or common_tree == None: 
                 print(f"Options 2 and 3 ({ACADEMIES[2]} and {ACADEMIES[3]}) must be selected before showing any data.\n")
             else:
-                # tree_data list resets every time new files are read
-                if len(trees_data) == 0: # If it has not already been created with these files
-                    trees = (academy_a, academy_b, added_tree, common_tree)
-                    for tree in trees:
-                        trees_data.append(tree_data(tree, LANGUAGE, STUDENTS, LEVEL)) 
+                # Each tree keeps the statistics of its courses, so they are not visited again
+                trees = (academy_a, academy_b, added_tree, common_tree)
 
                 if side_op == OPTIONS[1]: # Average number of students per language.
                     print(f"You selected: {SIDE_MENU_OP[1]}\n")
                     for i in range(len(ACADEMIES)):
-                        show_data(trees_data[i], LANGUAGE, STUDENTS, ACADEMIES[i])
+                        show_data(group_data(trees[i], "language", LANGUAGE, STUDENTS), LANGUAGE, STUDENTS, ACADEMIES[i])
 
                 elif side_op == OPTIONS[2]: # Average number of students per level.
                     print(f"You selected: {SIDE_MENU_OP[2]}\n")
                     for i in range(len(ACADEMIES)):
-                        show_data(trees_data[i], LEVEL, STUDENTS, ACADEMIES[i])
+                        show_data(group_data(trees[i], "level", LEVEL, STUDENTS), LEVEL, STUDENTS, ACADEMIES[i])
 
                 else: # total income
                     print(f"You selected: {SIDE_MENU_OP[3]}\n")
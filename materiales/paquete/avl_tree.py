@@ -25,6 +25,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import ProcessPoolExecutor
+
 from .binary_search_tree import BST
 
 class AVL(BST):
@@ -35,12 +37,14 @@ class AVL(BST):
     """Node class for AVL maintains height value for balancing.
 
     We use convention that a "None" child has height 0, thus a leaf has height 1.
+    The node also knows the number of nodes of its subtree, used by the join-based algorithms.
     """
-    __slots__ = '_height'         # additional data member to store height
+    __slots__ = '_height', '_count' # additional data members to store height and subtree size
 
     def __init__(self, element, parent=None, left=None, right=None):
       super().__init__(element, parent, left, right)
       self._height = 0            # will be recomputed during balancing
+      self._count = 1
       
     def left_height(self):
       return self._left._height if self._left is not None else 0
@@ -48,9 +52,20 @@ class AVL(BST):
     def right_height(self):
       return self._right._height if self._right is not None else 0
 
+    def left_count(self):
+      return self._left._count if self._left is not None else 0
+
+    def right_count(self):
+      return self._right._count if self._right is not None else 0
+
   #------------------------- positional-based utility methods -------------------------
+  def _recompute_node(self, node):
+    """Recompute the data that node keeps about its subtree from its children."""
+    node._height = 1 + max(node.left_height(), node.right_height())
+    node._count = 1 + node.left_count() + node.right_count()
+
   def _recompute_height(self, p):
-    p._node._height = 1 + max(p._node.left_height(), p._node.right_height())
+    self._recompute_node(p._node)
 
   def _isbalanced(self, p):
     return abs(p._node.left_height() - p._node.right_height()) <= 1
@@ -78,10 +93,17 @@ class AVL(BST):
         self._recompute_height(self.right(p))                           
       self._recompute_height(p)                             # adjust for recent changes
       if p._node._height == old_height:                     # has height changed?
-        p = None                                            # no further changes needed
+        self._recompute_ancestors(p._node._parent)          # but sizes change up to the root
+        p = None                                            # no further rotations needed
       else:
         p = self.parent(p)                                  # repeat with parent
 
+  def _recompute_ancestors(self, node):
+    """Recompute the sizes of node and its ancestors, whose heights have not changed."""
+    while node is not None:
+      node._count = 1 + node.left_count() + node.right_count()
+      node = node._parent
+
   #---------------------------- override balancing hooks ----------------------------
   def _rebalance_insert(self, p):
     self._rebalance(p)
@@ -89,6 +111,290 @@ class AVL(BST):
   def _rebalance_delete(self, p):
     self._rebalance(p)
 
+  def _rebalance_bulk(self, node, n):
+    node._height = n.bit_length()            # height of a perfectly balanced subtree
+    node._count = n
+
+  #------------------ nonpublic utilities for join-based algorithms ------------------
+  # They work on detached subtrees given by their root nodes (None if empty)
+  # and return the root node of the resulting subtree.
+  def _height(self, node):
+    return node._height if node is not None else 0
+
+  def _subtree_size(self, node):
+    return node._count if node is not None else 0
+
+  def _link(self, left, node, right):
+    """Make left and right the subtrees of node."""
+    self._relink(node, left, True)           # inherited from BST
+    self._relink(node, right, False)
+    self._recompute_node(node)
+    return node
+
+  def _detach(self, node):
+    if node is not None:
+      node._parent = None
+    return node
+
+  def _rotate_left(self, node):
+    right = node._right
+    return self._link(self._link(node._left, node, right._left), right, right._right)
+
+  def _rotate_right(self, node):
+    left = node._left
+    return self._link(left._left, left, self._link(left._right, node, node._right))
+
+  def _join_right(self, left, node, right):
+    """Join when left is taller than right: node and right go down the right spine of left."""
+    l, c = left._left, left._right
+    if self._height(c) <= self._height(right) + 1:
+      t = self._link(c, node, right)
+      if t._height <= self._height(l) + 1:
+        return self._link(l, left, t)
+      return self._rotate_left(self._link(l, left, self._rotate_right(t)))
+    t = self._join_right(c, node, right)
+    if t._height <= self._height(l) + 1:
+      return self._link(l, left, t)
+    return self._rotate_left(self._link(l, left, t))
+
+  def _join_left(self, left, node, right):
+    """Join when right is taller than left (mirror image of _join_right)."""
+    c, r = right._left, right._right
+    if self._height(c) <= self._height(left) + 1:
+      t = self._link(left, node, c)
+      if t._height <= self._height(r) + 1:
+        return self._link(t, right, r)
+      return self._rotate_right(self._link(self._rotate_left(t), right, r))
+    t = self._join_left(left, node, c)
+    if t._height <= self._height(r) + 1:
+      return self._link(t, right, r)
+    return self._rotate_right(self._link(t, right, r))
+
+  def _join(self, left, node, right):
+    """Return the subtree with left, node and right, whose keys are in increasing order."""
+    if self._height(left) > self._height(right) + 1:
+      root = self._join_right(left, node, right)
+    elif self._height(right) > self._height(left) + 1:
+      root = self._join_left(left, node, right)
+    else:
+      root = self._link(left, node, right)
+    return self._detach(root)
+
+  def _split(self, node, k):
+    """Return (subtree with keys < k, node with key k or None, subtree with keys > k)."""
+    if node is None:
+      return None, None, None
+    key = node._element._key
+    left, right = node._left, node._right
+    if k < key:
+      l, found, r = self._split(left, k)
+      return l, found, self._join(r, node, right)
+    elif key < k:
+      l, found, r = self._split(right, k)
+      return self._join(left, node, l), found, r
+    return self._detach(left), node, self._detach(right)
+
+  def _split_last(self, node):
+    """Return (subtree without its last node, last node)."""
+    if node._right is None:
+      return self._detach(node._left), node
+    rest, last = self._split_last(node._right)
+    return self._join(node._left, node, rest), last
+
+  def _join2(self, left, right):
+    """Return the subtree with left and right, whose keys are in increasing order."""
+    if left is None:
+      return right
+    rest, last = self._split_last(left)
+    return self._join(rest, last, right)
+
+  def _union(self, t1, t2, combine, matches):
+    if t1 is None:
+      return t2
+    if t2 is None:
+      return t1
+    l2, found, r2 = self._split(t2, t1._element._key)
+    left, right = t1._left, t1._right
+    l = self._union(left, l2, combine, matches)
+    r = self._union(right, r2, combine, matches)
+    if found is not None:                    # same key in both: values are combined
+      matches.append(found)
+      value = found._element._value
+      t1._element._value = combine(t1._element._value, value) if combine else value
+    return self._join(l, t1, r)
+
+  def _intersection(self, t1, t2, combine, matches):
+    if t1 is None or t2 is None:
+      return None
+    l2, found, r2 = self._split(t2, t1._element._key)
+    left, right = t1._left, t1._right
+    l = self._intersection(left, l2, combine, matches)
+    r = self._intersection(right, r2, combine, matches)
+    if found is None:                        # t1 is not in the intersection
+      return self._join2(l, r)
+    matches.append(found)
+    if combine:
+      t1._element._value = combine(t1._element._value, found._element._value)
+    return self._join(l, t1, r)
+
+  def _difference(self, t1, t2, matches):
+    if t1 is None or t2 is None:
+      return t1
+    l1, found, r1 = self._split(t1, t2._element._key)
+    left, right = t2._left, t2._right
+    l = self._difference(l1, left, matches)
+    r = self._difference(r1, right, matches)
+    if found is not None:
+      matches.append(found)
+    return self._join2(l, r)
+
+  def _check_type(self, other):
+    if not type(self) is type(other):        # nodes of both trees must be of the same type
+      raise TypeError('Tree types must match')
+
+  def _empty_like(self):
+    """Return a new empty map of the same class and with the same configuration."""
+    return type(self)()
+
+  def _release(self):
+    """Empty the map and return its root, so that its nodes can be moved to another tree."""
+    if self._has_value_hooks():
+      for v in self.values():
+        self._value_removed(v)
+    root = self._root
+    self._root = None
+    self._size = 0
+    return root
+
+  def _acquire(self, root, size):
+    """Make the map store the (detached) subtree root, which has size nodes."""
+    self._root = self._detach(root)
+    self._size = size
+    if self._has_value_hooks():
+      for v in self.values():
+        self._value_added(v)
+
+  #--------------------- public methods for join-based algorithms ---------------------
+  # The items are moved between trees, not copied, so the maps given as operands
+  # become empty and positions of their items must not be used any more.
+  # Both maps must be of the same class (raise TypeError if not), as in _attach,
+  # and new maps are created by _empty_like, so they keep the configuration of the operands.
+  # Subclasses that keep aggregates of the values (see _value_added) are updated
+  # value by value, in time proportional to the sizes of the maps.
+  def split(self, k):
+    """Return two maps of the same class with the items whose key is < k and >= k in O(log n) time.
+
+    The map becomes empty.
+    """
+    n = len(self)
+    left, found, right = self._split(self._release(), k)
+    if found is not None:                    # key k goes to the second map
+      right = self._join(None, found, right)
+    first, second = self._empty_like(), self._empty_like()
+    size = self._subtree_size(left)
+    first._acquire(left, size)
+    second._acquire(right, n - size)
+    return first, second
+
+  @classmethod
+  def join(cls, left, k, v, right):
+    """Return a new map with the items of left, item (k,v) and the items of right in O(log n) time.
+
+    All keys of left must be less than k and all keys of right greater than k (raise ValueError if not).
+    The items of left and right are moved to the new map, so they become empty.
+    Raise TypeError if left and right are not maps of class cls.
+    """
+    tree = left._empty_like() if type(left) is cls else cls()
+    tree._check_type(left)
+    tree._check_type(right)
+    if (left and not left.find_max()[0] < k) or (right and not k < right.find_min()[0]):
+      raise ValueError('Keys must be in strictly increasing order')
+    size = len(left) + len(right) + 1
+    root = tree._join(left._release(), tree._Node(tree._Item(k, v)), right._release())
+    tree._acquire(root, size)
+    return tree
+
+  def union(self, other, combine=None, workers=None):
+    """Add the items of other to the map in O(m log(n/m + 1)) time, with m <= n the sizes of both maps.
+
+    For a key in both maps, the value is combine(own value, value of other),
+    or the value of other if combine is None (as update does).
+    If workers is given, the union is split in ranges of keys that are joined
+    by a pool of that many processes (combine must be picklable).
+    The items of other are moved to the map, so other becomes empty.
+    """
+    self._check_type(other)
+    n = len(self) + len(other)
+    matches = []
+    if workers is not None and self._root is not None and other._root is not None:
+      root = self._parallel_union(self._release(), other._release(), combine, workers, matches)
+    else:
+      root = self._union(self._release(), other._release(), combine, matches)
+    self._acquire(root, n - len(matches))
+
+  def intersection(self, other, combine=None):
+    """Keep only the items of the map whose key is also in other, in O(m log(n/m + 1)) time.
+
+    The value is combine(own value, value of other), or the own value if combine is None.
+    Other becomes empty.
+    """
+    self._check_type(other)
+    matches = []
+    root = self._intersection(self._release(), other._release(), combine, matches)
+    self._acquire(root, len(matches))
+
+  def difference(self, other):
+    """Remove from the map the keys that are in other, in O(m log(n/m + 1)) time.
+
+    Other becomes empty.
+    """
+    self._check_type(other)
+    n = len(self)
+    matches = []
+    root = self._difference(self._release(), other._release(), matches)
+    self._acquire(root, n - len(matches))
+
+  def _parallel_union(self, t1, t2, combine, workers, matches):
+    """Union of t1 and t2 computed by ranges of keys in a pool of processes."""
+    pivots = []                              # top levels of t1 give balanced ranges
+    level = [t1]
+    while len(pivots) < workers - 1 and level:
+      pivots.extend(node._element._key for node in level)
+      level = [child for node in level for child in (node._left, node._right) if child is not None]
+    pivots.sort()
+    parts, middles = [], []
+    for key in pivots:                       # pivots are keys of t1, so they are always found
+      l1, middle, t1 = self._split(t1, key)
+      l2, found, t2 = self._split(t2, key)
+      if found is not None:
+        matches.append(found)
+        value = found._element._value
+        middle._element._value = combine(middle._element._value, value) if combine else value
+      parts.append((l1, l2))
+      middles.append(middle)
+    parts.append((t1, t2))
+    items = [([(node._element._key, node._element._value) for node in self._subtree_nodes(a)],
+              [(node._element._key, node._element._value) for node in self._subtree_nodes(b)])
+             for a, b in parts]
+    with ProcessPoolExecutor(workers) as executor:
+      results = list(executor.map(_union_items, *zip(*items), [combine] * len(items)))
+    subtrees = []
+    for (items_1, items_2), result in zip(items, results):
+      matches.extend([None] * (len(items_1) + len(items_2) - len(result)))
+      nodes = [self._Node(self._Item(k, v)) for k, v in result]
+      subtrees.append(self._build_balanced(nodes, 0, len(nodes), None))
+    root = subtrees[0]
+    for middle, subtree in zip(middles, subtrees[1:]):
+      root = self._join(root, middle, subtree)
+    return root
+
+
+def _union_items(items_1, items_2, combine):
+  """Return the (key,value) pairs of the union of two sorted lists of pairs (run by a worker)."""
+  tree, other = AVL.from_sorted(items_1), AVL.from_sorted(items_2)
+  tree.union(other, combine)
+  return list(tree.items())
+
 if __name__ == '__main__':
     # Solo para mostrar el funcionamiento de un BST. NO es un test exhaustivo
 
@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# B+ tree with the interface of the sorted maps of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, ValuesView
+
+from .map_base import MapBase
+
+class BTree(MapBase):
+  """Sorted map implementation using a B+ tree.
+
+  The items are stored in the leaves, in order, and the leaves are linked with
+  their neighbors, so iterations walk the leaves without going up the tree.
+  Each node has at most order keys (leaves) or children (internal nodes) and,
+  except the root, at least (order + 1) // 2.
+
+  It has the map and positional methods of BST (positions are a leaf and an index,
+  so any insertion or deletion makes them invalid), but the nodes do not know
+  the size of their subtree, so there is no select.
+  """
+
+  DEFAULT_ORDER = 64
+
+  #-------------------------- nested node classes --------------------------
+  class _Leaf:
+    """Lightweight, nonpublic class for storing a leaf."""
+    __slots__ = '_keys', '_values', '_prev', '_next'
+
+    def __init__(self, keys, values, prev=None, next=None):
+      self._keys = keys
+      self._values = values
+      self._prev = prev
+      self._next = next
+
+  class _Internal:
+    """Lightweight, nonpublic class for storing an internal node.
+
+    _keys[i] is the minimum key of the subtree _children[i + 1].
+    """
+    __slots__ = '_keys', '_children'
+
+    def __init__(self, keys, children):
+      self._keys = keys
+      self._children = children
+
+  #-------------------------- nested Position class --------------------------
+  class Position:
+    """An abstraction representing the location of an item (a leaf and an index in it)."""
+    __slots__ = '_container', '_leaf', '_index', '_version'
+
+    def __init__(self, container, leaf, index):
+      """Constructor should not be invoked by user."""
+      self._container = container
+      self._leaf = leaf
+      self._index = index
+      self._version = container._version   # positions are valid until the tree changes
+
+    def key(self):
+      """Return key of map's key-value pair."""
+      return self._leaf._keys[self._index]
+
+    def value(self):
+      """Return value of map's key-value pair."""
+      return self._leaf._values[self._index]
+
+    def __eq__(self, other):
+      """Return True if other is a Position representing the same location."""
+      return type(other) is type(self) and other._leaf is self._leaf and other._index == self._index
+
+    def __ne__(self, other):
+      """Return True if other does not represent the same location."""
+      return not (self == other)
+
+  #------------------------- views that iterate over the leaves -------------------------
+  class _ItemsView(ItemsView):
+    def __iter__(self):
+      for leaf in self._mapping._leaves():
+        yield from zip(leaf._keys, leaf._values)
+
+    def __reversed__(self):
+      for leaf in self._mapping._leaves_reversed():
+        yield from zip(reversed(leaf._keys), reversed(leaf._values))
+
+  class _ValuesView(ValuesView):
+    def __iter__(self):
+      for leaf in self._mapping._leaves():
+        yield from leaf._values
+
+    def __reversed__(self):
+      for leaf in self._mapping._leaves_reversed():
+        yield from reversed(leaf._values)
+
+  #-------------------------- B+ tree constructor --------------------------
+  def __init__(self, order=None):
+    """Create an initially empty tree whose nodes have at most order keys or children."""
+    self._order = order if order is not None else self.DEFAULT_ORDER
+    if self._order < 3:
+      raise ValueError('Order must be at least 3')
+    self._root = self._first = self._Leaf([], [])  # first leaf is never replaced
+    self._size = 0
+    self._version = 0                              # changed by insertions and deletions
+
+  @classmethod
+  def from_sorted(cls, items, sort=False, order=None):
+    """Return a new tree built in O(n) time from an iterable of (key,value) pairs.
+
+    The pairs must be given in strictly increasing order of key (raise ValueError if not).
+    If sort is True, the pairs are first sorted by key and, for repeated keys,
+    only the last value is kept (as successive assignments would do).
+    """
+    tree = cls(order)
+    items = cls._sorted_pairs(items, sort)
+    if not items:
+      return tree
+    keys = [k for k, v in items]
+    values = [v for k, v in items]
+    for v in values:
+      tree._value_added(v)                   # hook for subclasses with aggregates
+    level = []
+    for lo, hi in tree._chunks(len(items)):
+      leaf = tree._Leaf(keys[lo:hi], values[lo:hi], level[-1] if level else None)
+      if level:
+        level[-1]._next = leaf
+      level.append(leaf)
+    tree._first = level[0]
+    mins = [leaf._keys[0] for leaf in level]
+    while len(level) > 1:                    # build each level over the previous one
+      upper, upper_mins = [], []
+      for lo, hi in tree._chunks(len(level)):
+        upper.append(tree._Internal(mins[lo + 1:hi], level[lo:hi]))
+        upper_mins.append(mins[lo])
+      level, mins = upper, upper_mins
+    tree._root = level[0]
+    tree._size = len(items)
+    return tree
+
+  def _chunks(self, n):
+    """Divide range(n) in the fewest consecutive (lo, hi) ranges of at most order elements."""
+    count = -(-n // self._order)
+    size, extra = divmod(n, count)
+    lo = 0
+    for i in range(count):
+      hi = lo + size + (1 if i < extra else 0)
+      yield lo, hi
+      lo = hi
+
+  #------------------------------- nonpublic utilities -------------------------------
+  def _leaf_for(self, k):
+    """Return the leaf where key k is or should be."""
+    node = self._root
+    while type(node) is self._Internal:
+      node = node._children[bisect_right(node._keys, k)]
+    return node
+
+  def _last(self):
+    node = self._root
+    while type(node) is self._Internal:
+      node = node._children[-1]
+    return node
+
+  def _leaves(self):
+    leaf = self._first
+    while leaf is not None:
+      yield leaf
+      leaf = leaf._next
+
+  def _leaves_reversed(self):
+    leaf = self._last()
+    while leaf is not None:
+      yield leaf
+      leaf = leaf._prev
+
+  def _locate(self, leaf, i):
+    """Return (leaf, i) for index i of leaf, moving to a neighbor leaf if i is out of it (or None)."""
+    if i < 0:
+      leaf = leaf._prev
+      if leaf is None:
+        return None
+      i = len(leaf._keys) - 1
+    elif i == len(leaf._keys):
+      leaf = leaf._next
+      if leaf is None:
+        return None
+      i = 0
+    return leaf, i
+
+  def _pair(self, leaf, i):
+    """Return (key,value) pair at index i of leaf, moving to a neighbor leaf if i is out of it."""
+    location = self._locate(leaf, i)
+    if location is None:
+      return None
+    leaf, i = location
+    return (leaf._keys[i], leaf._values[i])
+
+  def _make_position(self, leaf, i):
+    """Return Position at index i of leaf, moving to a neighbor leaf if i is out of it (or None)."""
+    location = self._locate(leaf, i)
+    return self.Position(self, *location) if location is not None else None
+
+  def _validate(self, p):
+    """Return p if it is a valid position of the tree."""
+    if not isinstance(p, self.Position):
+      raise TypeError('p must be proper Position type')
+    if p._container is not self:
+      raise ValueError('p does not belong to this container')
+    if p._version != self._version:
+      raise ValueError('p is no longer valid')
+    return p
+
+  def _insert(self, node, k, v):
+    """Insert (k,v) in the subtree of node and return (key, new node) if node was split."""
+    if type(node) is self._Internal:
+      i = bisect_right(node._keys, k)
+      split = self._insert(node._children[i], k, v)
+      if split is None:
+        return None
+      node._keys.insert(i, split[0])
+      node._children.insert(i + 1, split[1])
+      if len(node._children) <= self._order:
+        return None
+      mid = len(node._keys) // 2               # middle key goes up
+      right = self._Internal(node._keys[mid + 1:], node._children[mid + 1:])
+      key = node._keys[mid]
+      del node._keys[mid:]
+      del node._children[mid + 1:]
+      return key, right
+    i = bisect_left(node._keys, k)
+    if i < len(node._keys) and node._keys[i] == k:  # replace existing item's value
+      old = node._values[i]
+      node._values[i] = v
+      self._value_removed(old)                 # hooks for subclasses with aggregates
+      self._value_added(v)
+      return None
+    node._keys.insert(i, k)
+    node._values.insert(i, v)
+    self._size += 1
+    self._version += 1
+    self._value_added(v)                       # hook for subclasses with aggregates
+    if len(node._keys) <= self._order:
+      return None
+    mid = len(node._keys) // 2
+    right = self._Leaf(node._keys[mid:], node._values[mid:], node, node._next)
+    if node._next is not None:
+      node._next._prev = right
+    node._next = right
+    del node._keys[mid:]
+    del node._values[mid:]
+    return right._keys[0], right
+
+  def _remove(self, node, k):
+    """Remove key k from the subtree of node and return its value (raise KeyError if not found)."""
+    if type(node) is self._Internal:
+      i = bisect_right(node._keys, k)
+      value = self._remove(node._children[i], k)
+      child = node._children[i]
+      if len(child._keys if type(child) is self._Leaf else child._children) < (self._order + 1) // 2:
+        self._fix_child(node, i)
+      return value
+    i = bisect_left(node._keys, k)
+    if i == len(node._keys) or node._keys[i] != k:
+      raise KeyError('Key Error: ' + repr(k))
+    value = node._values.pop(i)
+    del node._keys[i]
+    self._size -= 1
+    self._version += 1
+    return value
+
+  def _fix_child(self, node, i):
+    """Refill child i of node, which has too few keys, from a sibling or merge it with one."""
+    minimum = (self._order + 1) // 2
+    child = node._children[i]
+    left = node._children[i - 1] if i > 0 else None
+    right = node._children[i + 1] if i + 1 < len(node._children) else None
+    if type(child) is self._Leaf:
+      if left is not None and len(left._keys) > minimum:      # borrow last item of left
+        child._keys.insert(0, left._keys.pop())
+        child._values.insert(0, left._values.pop())
+        node._keys[i - 1] = child._keys[0]
+      elif right is not None and len(right._keys) > minimum:  # borrow first item of right
+        child._keys.append(right._keys.pop(0))
+        child._values.append(right._values.pop(0))
+        node._keys[i] = right._keys[0]
+      else:                                                   # merge with a sibling
+        j = i - 1 if left is not None else i
+        first, second = node._children[j], node._children[j + 1]
+        first._keys.extend(second._keys)
+        first._values.extend(second._values)
+        first._next = second._next
+        if second._next is not None:
+          second._next._prev = first
+        del node._keys[j]
+        del node._children[j + 1]
+    else:
+      if left is not None and len(left._children) > minimum:  # rotate from left
+        child._keys.insert(0, node._keys[i - 1])
+        child._children.insert(0, left._children.pop())
+        node._keys[i - 1] = left._keys.pop()
+      elif right is not None and len(right._children) > minimum:  # rotate from right
+        child._keys.append(node._keys[i])
+        child._children.append(right._children.pop(0))
+        node._keys[i] = right._keys.pop(0)
+      else:                                                   # merge with a sibling
+        j = i - 1 if left is not None else i
+        first, second = node._children[j], node._children[j + 1]
+        first._keys.append(node._keys[j])
+        first._keys.extend(second._keys)
+        first._children.extend(second._children)
+        del node._keys[j]
+        del node._children[j + 1]
+
+  #--------------------- public methods providing "positional" support ---------------------
+  def first(self):
+    """Return the first Position in the tree (or None if empty)."""
+    return self._make_position(self._first, 0) if self._size > 0 else None
+
+  def last(self):
+    """Return the last Position in the tree (or None if empty)."""
+    leaf = self._last()
+    return self._make_position(leaf, len(leaf._keys) - 1) if self._size > 0 else None
+
+  def before(self, p):
+    """Return the Position just before p in the natural order (None if p is the first position)."""
+    self._validate(p)
+    return self._make_position(p._leaf, p._index - 1)
+
+  def after(self, p):
+    """Return the Position just after p in the natural order (None if p is the last position)."""
+    self._validate(p)
+    return self._make_position(p._leaf, p._index + 1)
+
+  def find_position(self, k):
+    """Return position with key k, or else neighbor (or None if empty)."""
+    if self._size == 0:
+      return None
+    leaf = self._leaf_for(k)
+    return self._make_position(leaf, min(bisect_left(leaf._keys, k), len(leaf._keys) - 1))
+
+  def find_key(self, k):
+    """Return Position with key k, or None if not found."""
+    leaf = self._leaf_for(k)
+    i = bisect_left(leaf._keys, k)
+    return self.Position(self, leaf, i) if i < len(leaf._keys) and leaf._keys[i] == k else None
+
+  def delete(self, p):
+    """Remove the item at given Position."""
+    self.pop(self._validate(p).key())
+
+  #--------------------- public methods for (standard) map interface ---------------------
+  def __len__(self):
+    """Return the total number of items in the map."""
+    return self._size
+
+  def __getitem__(self, k):
+    """Return value associated with key k (raise KeyError if not found)."""
+    leaf = self._leaf_for(k)
+    i = bisect_left(leaf._keys, k)
+    if i == len(leaf._keys) or leaf._keys[i] != k:
+      raise KeyError('Key Error: ' + repr(k))
+    return leaf._values[i]
+
+  def get(self, k, default=None):
+    """Return value associated with key k, or default if not found."""
+    leaf = self._leaf_for(k)
+    i = bisect_left(leaf._keys, k)
+    return leaf._values[i] if i < len(leaf._keys) and leaf._keys[i] == k else default
+
+  def __contains__(self, k):
+    """Return True if the map has key k."""
+    leaf = self._leaf_for(k)
+    i = bisect_left(leaf._keys, k)
+    return i < len(leaf._keys) and leaf._keys[i] == k
+
+  def __setitem__(self, k, v):
+    """Assign value v to key k, overwriting existing value if present."""
+    split = self._insert(self._root, k, v)
+    if split is not None:                      # root was split: tree grows one level
+      self._root = self._Internal([split[0]], [self._root, split[1]])
+
+  def pop(self, k, *default):
+    """Remove the item with key k and return its value.
+
+    If k is not found, return default if it is given, or else raise KeyError.
+    """
+    try:
+      value = self._remove(self._root, k)
+    except KeyError:
+      if default:
+        return default[0]
+      raise
+    self._value_removed(value)                 # hook for subclasses with aggregates
+    if type(self._root) is self._Internal and len(self._root._children) == 1:
+      self._root = self._root._children[0]     # tree shrinks one level
+    return value
+
+  def __delitem__(self, k):
+    """Remove item associated with key k (raise KeyError if not found)."""
+    self.pop(k)
+
+  def get_many(self, keys, default=None):
+    """Return a list with the value of each key of keys (default if not found).
+
+    Consecutive keys in the same leaf are found without going down the tree again,
+    so if keys are sorted each leaf is reached once.
+    """
+    values = []
+    leaf = self._first
+    for k in keys:
+      found = leaf._keys
+      if not found or k < found[0] or found[-1] < k:   # k is out of the current leaf
+        leaf = self._leaf_for(k)
+        found = leaf._keys
+      i = bisect_left(found, k)
+      values.append(leaf._values[i] if i < len(found) and found[i] == k else default)
+    return values
+
+  def __iter__(self):
+    """Generate an iteration of all keys in the map in order."""
+    for leaf in self._leaves():
+      yield from leaf._keys
+
+  def items(self):
+    """Return a view of the (key,value) pairs that iterates over the leaves."""
+    return self._ItemsView(self)
+
+  def values(self):
+    """Return a view of the values that iterates over the leaves."""
+    return self._ValuesView(self)
+
+  #--------------------- public methods for sorted map interface ---------------------
+  def __reversed__(self):
+    """Generate an iteration of all keys in the map in reverse order."""
+    for leaf in self._leaves_reversed():
+      yield from reversed(leaf._keys)
+
+  def find_min(self):
+    """Return (key,value) pair with minimum key (or None if empty)."""
+    return self._pair(self._first, 0) if self._size > 0 else None
+
+  def find_max(self):
+    """Return (key,value) pair with maximum key (or None if empty)."""
+    leaf = self._last()
+    return self._pair(leaf, len(leaf._keys) - 1) if self._size > 0 else None
+
+  def find_le(self, k):
+    """Return (key,value) pair with greatest key less than or equal to k.
+
+    Return None if there does not exist such a key.
+    """
+    leaf = self._leaf_for(k)
+    return self._pair(leaf, bisect_right(leaf._keys, k) - 1)
+
+  def find_lt(self, k):
+    """Return (key,value) pair with greatest key strictly less than k.
+
+    Return None if there does not exist such a key.
+    """
+    leaf = self._leaf_for(k)
+    return self._pair(leaf, bisect_left(leaf._keys, k) - 1)
+
+  def find_ge(self, k):
+    """Return (key,value) pair with least key greater than or equal to k.
+
+    Return None if there does not exist such a key.
+    """
+    leaf = self._leaf_for(k)
+    return self._pair(leaf, bisect_left(leaf._keys, k))
+
+  def find_gt(self, k):
+    """Return (key,value) pair with least key strictly greater than k.
+
+    Return None if there does not exist such a key.
+    """
+    leaf = self._leaf_for(k)
+    return self._pair(leaf, bisect_right(leaf._keys, k))
+
+  def find_range(self, start, stop):
+    """Iterate all (key,value) pairs such that start <= key < stop.
+
+    If start is None, iteration begins with minimum key of map.
+    If stop is None, iteration continues through the maximum key of map.
+    """
+    if start is None:
+      leaf, i = self._first, 0
+    else:
+      leaf = self._leaf_for(start)
+      i = bisect_left(leaf._keys, start)
+    while leaf is not None:                    # walk the leaves to the right
+      keys, values = leaf._keys, leaf._values
+      for j in range(i, len(keys)):
+        if stop is not None and not keys[j] < stop:
+          return
+        yield (keys[j], values[j])
+      leaf, i = leaf._next, 0
+
+  #--------------------- hooks used by subclasses to maintain aggregates ---------------------
+  def _value_added(self, v):
+    """Call to indicate that value v is now stored in the map."""
+    pass
+
+  def _value_removed(self, v):
+    """Call to indicate that value v is no longer stored in the map."""
+    pass
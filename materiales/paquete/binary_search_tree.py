@@ -25,10 +25,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections.abc import ItemsView, ValuesView
+import pickle
+
 from .linked_positional_binary_tree import LinkedPositionalBinaryTree
 
 from .map_base import MapBase
 
+from .frozen_map import FrozenMap, _pack_strings, _unpack_strings
+
 class BST(LinkedPositionalBinaryTree, MapBase):
   """Sorted map implementation using a binary search tree."""
 
@@ -42,18 +47,179 @@ class BST(LinkedPositionalBinaryTree, MapBase):
       """Return value of map's key-value pair."""
       return self.element()._value
 
+  #-------------------------- nested Cursor class --------------------------
+  class Cursor:
+    """A movable reference to an item that starts each search from its current node (finger).
+
+    Moving the cursor does not validate it again: a cursor must not be used after the
+    tree is modified, except for seek, which then starts again from the root.
+    """
+    __slots__ = '_tree', '_node'
+
+    def __init__(self, tree, node):
+      """Constructor should not be invoked by user."""
+      self._tree = tree
+      self._node = node           # None if the cursor is not on an item
+
+    def __bool__(self):
+      """Return True if the cursor is on an item."""
+      return self._node is not None
+
+    def _element(self):
+      if self._node is None:
+        raise ValueError('Cursor is not on an item')
+      return self._node._element
+
+    def key(self):
+      """Return key of the item under the cursor."""
+      return self._element()._key
+
+    def value(self):
+      """Return value of the item under the cursor."""
+      return self._element()._value
+
+    def seek(self, k):
+      """Move to the item with least key greater than or equal to k, and return True if its key is k.
+
+      The search takes O(log d) time in a balanced tree, where d is the number of keys
+      between the current item and k.
+      """
+      node = self._node
+      if node is None or node._parent is node:   # start again from the root
+        node = self._tree._root
+        if node is None:
+          return False
+      node = self._tree._finger_search(node, k)
+      if node._element._key < k:                 # k is between node and its successor
+        node = self._tree._next_node(node)
+      self._node = node
+      return node is not None and node._element._key == k
+
+    def next(self):
+      """Move to the next item in key order, and return True if there is one."""
+      self._node = self._tree._next_node(self._node) if self._node is not None else None
+      return self._node is not None
+
+    def prev(self):
+      """Move to the previous item in key order, and return True if there is one."""
+      self._node = self._tree._prev_node(self._node) if self._node is not None else None
+      return self._node is not None
+
+  #------------------------- views that iterate over the nodes -------------------------
+  class _ItemsView(ItemsView):
+    def __iter__(self):
+      for node in self._mapping._inorder_nodes():
+        yield (node._element._key, node._element._value)
+
+    def __reversed__(self):
+      for node in self._mapping._reversed_nodes():
+        yield (node._element._key, node._element._value)
+
+  class _ValuesView(ValuesView):
+    def __iter__(self):
+      for node in self._mapping._inorder_nodes():
+        yield node._element._value
+
+    def __reversed__(self):
+      for node in self._mapping._reversed_nodes():
+        yield node._element._value
+
   #------------------------------- nonpublic utilities -------------------------------
+  def _search(self, node, k):
+    """Return node of node's subtree having key k, or last node searched."""
+    while True:
+      key = node._element._key
+      if k == key:                                     # found match
+        return node
+      child = node._left if k < key else node._right   # search left or right subtree
+      if child is None:                                # unsucessful search
+        return node
+      node = child
+
+  def _finger_search(self, node, k):
+    """Return node having key k, or last node searched, starting from any node (finger).
+
+    It goes up until k is inside the range of keys of the subtree and then goes down,
+    so it visits O(log d) nodes of a balanced tree, where d is the distance to k.
+    """
+    if k == node._element._key:
+      return node
+    forward = node._element._key < k                   # one bound of the subtrees is known
+    while node._parent is not None:
+      parent = node._parent
+      key = parent._element._key
+      if forward and node is parent._left and not key < k:
+        return parent if k == key else self._search(node, k)
+      if not forward and node is parent._right and not k < key:
+        return parent if k == key else self._search(node, k)
+      node = parent
+    return self._search(node, k)
+
+  def _next_node(self, node):
+    """Return the node after node in key order (or None)."""
+    if node._right is not None:
+      node = node._right
+      while node._left is not None:
+        node = node._left
+      return node
+    while node._parent is not None and node is node._parent._right:
+      node = node._parent
+    return node._parent
+
+  def _prev_node(self, node):
+    """Return the node before node in key order (or None)."""
+    if node._left is not None:
+      node = node._left
+      while node._right is not None:
+        node = node._right
+      return node
+    while node._parent is not None and node is node._parent._left:
+      node = node._parent
+    return node._parent
+
   def _subtree_search(self, p, k):
     """Return Position of p's subtree having key k, or last node searched."""
-    if k == p.key():                                   # found match
-      return p                                         
-    elif k < p.key():                                  # search left subtree
-      if self.left(p) is not None:
-        return self._subtree_search(self.left(p), k)   
-    else:                                              # search right subtree
-      if self.right(p) is not None:
-        return self._subtree_search(self.right(p), k)
-    return p                                           # unsucessful search
+    return self._make_position(self._search(self._validate(p), k))
+
+  def _inorder_nodes(self, start=None):
+    """Generate the nodes in key order, beginning with the first key >= start (all if None).
+
+    An explicit stack of the nodes whose left subtree is being visited replaces after(),
+    so each step takes amortized O(1) time and no Position is created.
+    """
+    return self._subtree_nodes(self._root, start)
+
+  def _subtree_nodes(self, node, start=None):
+    """Generate the nodes of node's subtree in key order (see _inorder_nodes)."""
+    stack = []
+    while node is not None:                            # stack path to the first node
+      if start is not None and node._element._key < start:
+        node = node._right                             # node and its left subtree are skipped
+      else:
+        stack.append(node)
+        node = node._left
+    while stack:
+      node = stack.pop()
+      yield node
+      node = node._right                               # next node is first of right subtree
+      while node is not None:
+        stack.append(node)
+        node = node._left
+
+  def _reversed_nodes(self):
+    """Generate the nodes in reverse key order (mirror image of _inorder_nodes)."""
+    stack = []
+    node = self._root
+    while node is not None:
+      stack.append(node)
+      node = node._right
+    while stack:
+      node = stack.pop()
+      yield node
+      node = node._left
+      while node is not None:
+        stack.append(node)
+        node = node._right
 
   def _subtree_first_position(self, p):
     """Return Position of first item in subtree rooted at p."""
@@ -69,6 +235,148 @@ class BST(LinkedPositionalBinaryTree, MapBase):
       walk = self.right(walk)
     return walk
   
+  def _build_balanced(self, nodes, lo, hi, parent):
+    """Link nodes[lo:hi] as a perfectly balanced subtree of parent and return its root node."""
+    if lo >= hi:
+      return None
+    mid = (lo + hi) // 2                               # median becomes subtree root
+    node = nodes[mid]
+    node._parent = parent
+    node._left = self._build_balanced(nodes, lo, mid, node)
+    node._right = self._build_balanced(nodes, mid + 1, hi, node)
+    self._rebalance_bulk(node, hi - lo)                # hook for balanced tree subclasses
+    return node
+
+  #-------------------------- bulk construction --------------------------
+  @classmethod
+  def from_sorted(cls, items, sort=False):
+    """Return a new tree built in O(n) time from an iterable of (key,value) pairs.
+
+    The pairs must be given in strictly increasing order of key (raise ValueError if not).
+    If sort is True, the pairs are first sorted by key and, for repeated keys,
+    only the last value is kept (as successive assignments would do).
+    """
+    tree = cls()
+    nodes = []
+    for k, v in cls._sorted_pairs(items, sort):
+      nodes.append(tree._Node(tree._Item(k, v)))
+      tree._value_added(v)                         # hook for subclasses with aggregates
+    tree._root = tree._build_balanced(nodes, 0, len(nodes), None)
+    tree._size = len(nodes)
+    return tree
+
+  def freeze(self):
+    """Return a FrozenMap with the items of the map in O(n) time (the map is not modified)."""
+    keys, values = [], []
+    for node in self._inorder_nodes():
+      keys.append(node._element._key)
+      values.append(node._element._value)
+    return FrozenMap(keys, values)
+
+  #-------------------------- bulk mutation --------------------------
+  def _few_changes(self, k):
+    """Return True if k single operations are cheaper than rebuilding the tree."""
+    return k * len(self).bit_length() < len(self)
+
+  def update_many(self, items, sort=False):
+    """Assign each value v to its key k for an iterable of (key,value) pairs.
+
+    The pairs must be given in strictly increasing order of key (see from_sorted).
+    A large batch is merged with the items of the tree and the tree is rebuilt once
+    in O(n + k) time; the existing nodes are reused, so their positions remain valid.
+    """
+    items = self._sorted_pairs(items, sort)
+    if self._few_changes(len(items)):
+      for k, v in items:
+        self[k] = v
+      return
+    nodes = []
+    existing = self._inorder_nodes()
+    node = next(existing, None)
+    for k, v in items:
+      while node is not None and node._element._key < k:  # unchanged nodes before k
+        nodes.append(node)
+        node = next(existing, None)
+      if node is not None and node._element._key == k:    # replace existing item's value
+        old = node._element._value
+        node._element._value = v
+        self._value_removed(old)                 # hooks for subclasses with aggregates
+        self._value_added(v)
+        nodes.append(node)
+        node = next(existing, None)
+      else:                                                 # new item
+        nodes.append(self._Node(self._Item(k, v)))
+        self._value_added(v)                     # hook for subclasses with aggregates
+    while node is not None:
+      nodes.append(node)
+      node = next(existing, None)
+    self._root = self._build_balanced(nodes, 0, len(nodes), None)
+    self._size = len(nodes)
+
+  def delete_many(self, keys, sort=False):
+    """Remove the items of an iterable of keys given in strictly increasing order.
+
+    Raise KeyError (leaving the map unchanged) if some key is not found.
+    A large batch is applied rebuilding the tree once in O(n + k) time.
+    """
+    keys = [k for k, _ in self._sorted_pairs(((k, None) for k in keys), sort)]
+    if self._few_changes(len(keys)):
+      for k in keys:
+        if k not in self:
+          raise KeyError('Key Error: ' + repr(k))
+      for k in keys:
+        del self[k]
+      return
+    nodes = []
+    removed = []
+    existing = self._inorder_nodes()
+    node = next(existing, None)
+    for k in keys:
+      while node is not None and node._element._key < k:  # nodes kept before k
+        nodes.append(node)
+        node = next(existing, None)
+      if node is None or node._element._key != k:
+        raise KeyError('Key Error: ' + repr(k))
+      removed.append(node)
+      node = next(existing, None)
+    while node is not None:
+      nodes.append(node)
+      node = next(existing, None)
+    for node in removed:
+      self._value_removed(node._element._value)  # hook for subclasses with aggregates
+      node._parent = node                        # convention for deprecated node
+    self._root = self._build_balanced(nodes, 0, len(nodes), None)
+    self._size = len(nodes)
+
+  #-------------------------- pickling support --------------------------
+  def _flat_state(self, protocol):
+    """Return (attributes, keys, values) with the keys and values in increasing order of key.
+
+    With protocol 5, string keys are packed in two buffers (UTF-8 bytes and their offsets)
+    that can be sent out-of-band.
+    """
+    keys, values = [], []
+    for node in self._inorder_nodes():
+      keys.append(node._element._key)
+      values.append(node._element._value)
+    if protocol >= 5 and all(type(k) is str for k in keys):
+      keys = tuple(pickle.PickleBuffer(buffer) for buffer in _pack_strings(keys))
+    return (self._attributes(), keys, values)
+
+  def __setstate__(self, state):
+    """Rebuild the tree from the state returned by _flat_state in O(n) time.
+
+    Subtree data is recomputed with _rebalance_bulk, and aggregates of the values
+    are restored with the attributes (value hooks are not called).
+    """
+    attributes, keys, values = state
+    self.__dict__.update(attributes)
+    if isinstance(keys, tuple):           # packed string keys
+      keys = _unpack_strings(*keys)
+    nodes = [self._Node(self._Item(k, v)) for k, v in zip(keys, values)]
+    self._root = self._build_balanced(nodes, 0, len(nodes), None)
+    self._size = len(nodes)
+
   #--------------------- public methods providing "positional" support ---------------------
   def first(self):
     """Return the first Position in the tree (or None if empty)."""
@@ -120,9 +428,45 @@ class BST(LinkedPositionalBinaryTree, MapBase):
       self._rebalance_access(p)                  # hook for balanced tree subclasses
       return p
 
+  def find_key(self, k, p=None):
+    """Return Position with key k in the subtree of p (the whole tree if p is None), or None."""
+    node = self._validate(p) if p is not None else self._root
+    if node is None:
+      return None
+    node = self._search(node, k)
+    return self._make_position(node) if node._element._key == k else None
+
+  def cursor(self, k=None):
+    """Return a Cursor on the item with least key greater than or equal to k (on the first item if k is None)."""
+    if k is None:
+      node = self._root
+      while node is not None and node._left is not None:
+        node = node._left
+      return self.Cursor(self, node)
+    cursor = self.Cursor(self, None)
+    cursor.seek(k)
+    return cursor
+
+  def get_many(self, keys, default=None):
+    """Return a list with the value of each key of keys (default if not found).
+
+    Each search starts from the node of the previous key, so if keys are sorted
+    the whole list is resolved in a single traversal of the tree.
+    """
+    values = []
+    node = self._root
+    for k in keys:
+      if node is None:
+        values.append(default)
+        continue
+      node = self._finger_search(node, k)
+      values.append(node._element._value if node._element._key == k else default)
+    return values
+
   def delete(self, p):
     """Remove the item at given Position."""
     self._validate(p)                            # inherited from LinkedBinaryTree
+    self._value_removed(p.value())               # hook for subclasses with aggregates
     if self.left(p) and self.right(p):           # p has two children
       replacement = self._subtree_last_position(self.left(p))
       self._replace(p, replacement.element())    # from LinkedBinaryTree
@@ -138,11 +482,27 @@ class BST(LinkedPositionalBinaryTree, MapBase):
     if self.is_empty():
       raise KeyError('Key Error: ' + repr(k))
     else:
-      p = self._subtree_search(self.root(), k)
-      self._rebalance_access(p)                  # hook for balanced tree subclasses
-      if k != p.key():
+      node = self._search(self._root, k)
+      if self._has_access_hook():                # Position only created if a subclass uses it
+        self._rebalance_access(self._make_position(node))
+      if k != node._element._key:
         raise KeyError('Key Error: ' + repr(k))
-      return p.value()
+      return node._element._value
+
+  def get(self, k, default=None):
+    """Return value associated with key k, or default if not found.
+
+    Only nodes are visited (no Position is created and _rebalance_access is not called).
+    """
+    if self._root is not None:
+      node = self._search(self._root, k)
+      if node._element._key == k:
+        return node._element._value
+    return default
+
+  def __contains__(self, k):
+    """Return True if the map has key k (see get)."""
+    return self._root is not None and self._search(self._root, k)._element._key == k
 
   def __setitem__(self, k, v):
     """Assign value v to key k, overwriting existing value if present."""
@@ -151,7 +511,10 @@ class BST(LinkedPositionalBinaryTree, MapBase):
     else:
       p = self._subtree_search(self.root(), k)
       if p.key() == k:
+        old = p.element()._value
         p.element()._value = v                   # replace existing item's value
+        self._value_removed(old)                 # hooks for subclasses with aggregates
+        self._value_added(v)
         self._rebalance_access(p)                # hook for balanced tree subclasses
         return
       else:
@@ -160,6 +523,7 @@ class BST(LinkedPositionalBinaryTree, MapBase):
           leaf = self._add_right(p, item)        # inherited from LinkedBinaryTree
         else:
           leaf = self._add_left(p, item)         # inherited from LinkedBinaryTree
+    self._value_added(v)                         # hook for subclasses with aggregates
     self._rebalance_insert(leaf)                 # hook for balanced tree subclasses
 
   def __delitem__(self, k):
@@ -174,18 +538,22 @@ class BST(LinkedPositionalBinaryTree, MapBase):
 
   def __iter__(self):
     """Generate an iteration of all keys in the map in order."""
-    p = self.first()
-    while p is not None:
-      yield p.key()
-      p = self.after(p)
+    for node in self._inorder_nodes():
+      yield node._element._key
+
+  def items(self):
+    """Return a view of the (key,value) pairs that iterates in key order without searches."""
+    return self._ItemsView(self)
+
+  def values(self):
+    """Return a view of the values that iterates in key order without searches."""
+    return self._ValuesView(self)
 
   #--------------------- public methods for sorted map interface ---------------------
   def __reversed__(self):
     """Generate an iteration of all keys in the map in reverse order."""
-    p = self.last()
-    while p is not None:
-      yield p.key()
-      p = self.before(p)
+    for node in self._reversed_nodes():
+      yield node._element._key
 
   def find_min(self):
     """Return (key,value) pair with minimum key (or None if empty)."""
@@ -261,17 +629,10 @@ class BST(LinkedPositionalBinaryTree, MapBase):
     If start is None, iteration begins with minimum key of map.
     If stop is None, iteration continues through the maximum key of map.
     """
-    if not self.is_empty():
-      if start is None:
-        p = self.first()
-      else:
-        # we initialize p with logic similar to find_ge
-        p = self.find_position(start)
-        if p.key() < start:
-          p = self.after(p)
-      while p is not None and (stop is None or p.key() < stop):
-        yield (p.key(), p.value())
-        p = self.after(p)
+    for node in self._inorder_nodes(start):
+      if stop is not None and not node._element._key < stop:
+        return
+      yield (node._element._key, node._element._value)
 
   #--------------------- hooks used by subclasses to balance a tree ---------------------
   def _rebalance_insert(self, p):
@@ -286,6 +647,27 @@ class BST(LinkedPositionalBinaryTree, MapBase):
     """Call to indicate that position p was recently accessed."""
     pass
 
+  def _rebalance_bulk(self, node, n):
+    """Call to indicate that node is the root of a new balanced subtree with n nodes."""
+    pass
+
+  def _has_access_hook(self):
+    """Return True if a subclass is notified of the accessed positions with _rebalance_access."""
+    return type(self)._rebalance_access is not BST._rebalance_access
+
+  #--------------------- hooks used by subclasses to maintain aggregates ---------------------
+  def _value_added(self, v):
+    """Call to indicate that value v is now stored in the map."""
+    pass
+
+  def _value_removed(self, v):
+    """Call to indicate that value v is no longer stored in the map."""
+    pass
+
+  def _has_value_hooks(self):
+    """Return True if a subclass maintains aggregates of the values with the hooks above."""
+    return type(self)._value_added is not BST._value_added
+
   #--------------------- nonpublic methods to support tree balancing ---------------------
 
   def _relink(self, parent, child, make_left_child):
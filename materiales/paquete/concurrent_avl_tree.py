@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# Thread-safe sorted map built on top of the persistent AVL tree, with the interface of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from .map_base import MapBase
+from .persistent_avl_tree import PersistentAVL
+
+class ReadWriteLock:
+  """Lock that can be held by many readers at the same time or by a single writer.
+
+  Waiting writers have preference, so a steady flow of readers cannot starve them.
+  """
+
+  def __init__(self):
+    self._condition = Condition(Lock())
+    self._readers = 0             # number of threads reading
+    self._writing = False         # True if a thread is writing
+    self._waiting = 0             # number of writers waiting for the lock
+
+  @contextmanager
+  def read(self):
+    """Context manager that holds the lock for reading."""
+    with self._condition:
+      while self._writing or self._waiting:
+        self._condition.wait()
+      self._readers += 1
+    try:
+      yield
+    finally:
+      with self._condition:
+        self._readers -= 1
+        if self._readers == 0:
+          self._condition.notify_all()
+
+  @contextmanager
+  def write(self):
+    """Context manager that holds the lock for writing."""
+    with self._condition:
+      self._waiting += 1
+      while self._writing or self._readers:
+        self._condition.wait()
+      self._waiting -= 1
+      self._writing = True
+    try:
+      yield
+    finally:
+      with self._condition:
+        self._writing = False
+        self._condition.notify_all()
+
+
+class ConcurrentAVL(MapBase):
+  """Sorted map that can be shared by many reader threads and writer threads.
+
+  Lookups read the tree holding a ReadWriteLock for reading, so they run at the same
+  time, and mutations hold it for writing. Iterations never walk the live nodes: they
+  run over a snapshot of the PersistentAVL, so they see a consistent view of the items
+  even if the tree is modified (or rotated) meanwhile. The snapshot is reused by all the
+  iterations until the next mutation.
+  """
+
+  def __init__(self, tree=None):
+    """Create a map that shares tree (a new empty PersistentAVL by default)."""
+    self._tree = tree if tree is not None else PersistentAVL()
+    self._lock = ReadWriteLock()
+    self._snapshot_lock = Lock()  # only one reader takes the snapshot
+    self._snapshot = None         # snapshot of current items, or None if not taken
+
+  #------------------------------- snapshots -------------------------------
+  def snapshot(self):
+    """Return a read-only AVLSnapshot with the current items of the map."""
+    with self._lock.read():
+      snapshot = self._snapshot
+      if snapshot is None:
+        with self._snapshot_lock:   # readers do not use the version that snapshot() changes
+          if self._snapshot is None:
+            self._snapshot = self._tree.snapshot()
+          snapshot = self._snapshot
+    return snapshot
+
+  @contextmanager
+  def _writing(self):
+    with self._lock.write():
+      try:
+        yield self._tree
+      finally:
+        self._snapshot = None       # next iteration needs a new snapshot
+
+  #--------------------- public methods for (standard) map interface ---------------------
+  def __len__(self):
+    """Return the total number of items in the map."""
+    with self._lock.read():
+      return len(self._tree)
+
+  def __getitem__(self, k):
+    """Return value associated with key k (raise KeyError if not found)."""
+    missing = object()
+    v = self.get(k, missing)
+    if v is missing:
+      raise KeyError('Key Error: ' + repr(k))
+    return v
+
+  def get(self, k, default=None):
+    """Return value associated with key k, or default if not found."""
+    with self._lock.read():
+      return self._tree.get(k, default)
+
+  def __contains__(self, k):
+    """Return True if the map has key k."""
+    with self._lock.read():
+      return k in self._tree
+
+  def __setitem__(self, k, v):
+    """Assign value v to key k, overwriting existing value if present."""
+    with self._writing() as tree:
+      tree[k] = v
+
+  def __delitem__(self, k):
+    """Remove item associated with key k (raise KeyError if not found)."""
+    with self._writing() as tree:
+      del tree[k]
+
+  def update_many(self, items, sort=False):
+    """Assign the values of an iterable of (key,value) pairs in a single mutation."""
+    items = list(items)             # consumed before taking the lock
+    with self._writing() as tree:
+      tree.update_many(items, sort)
+
+  def delete_many(self, keys, sort=False):
+    """Remove the items of an iterable of keys in a single mutation (the missing keys are ignored).
+
+    As in PersistentAVL.delete_many, the keys must be in strictly increasing order unless sort is True.
+    """
+    keys = list(keys)
+    with self._writing() as tree:
+      tree.delete_many([k for k in keys if k in tree], sort)   # checked while no one can write
+
+  def __iter__(self):
+    """Generate an iteration of the keys of a snapshot of the map in order."""
+    return iter(self.snapshot())
+
+  def items(self):
+    """Return a view of the (key,value) pairs of a snapshot of the map in key order."""
+    return self.snapshot().items()
+
+  def values(self):
+    """Return a view of the values of a snapshot of the map in key order."""
+    return self.snapshot().values()
+
+  #--------------------- public methods for sorted map interface ---------------------
+  def __reversed__(self):
+    """Generate an iteration of the keys of a snapshot of the map in reverse order."""
+    return reversed(self.snapshot())
+
+  def _read(self, method, *args):
+    with self._lock.read():
+      return getattr(self._tree, method)(*args)
+
+  def find_min(self):
+    """Return (key,value) pair with minimum key (or None if empty)."""
+    return self._read('find_min')
+
+  def find_max(self):
+    """Return (key,value) pair with maximum key (or None if empty)."""
+    return self._read('find_max')
+
+  def find_le(self, k):
+    """Return (key,value) pair with greatest key less than or equal to k (or None)."""
+    return self._read('find_le', k)
+
+  def find_lt(self, k):
+    """Return (key,value) pair with greatest key strictly less than k (or None)."""
+    return self._read('find_lt', k)
+
+  def find_ge(self, k):
+    """Return (key,value) pair with least key greater than or equal to k (or None)."""
+    return self._read('find_ge', k)
+
+  def find_gt(self, k):
+    """Return (key,value) pair with least key strictly greater than k (or None)."""
+    return self._read('find_gt', k)
+
+  def find_range(self, start, stop):
+    """Iterate all (key,value) pairs of a snapshot of the map such that start <= key < stop.
+
+    If start is None, iteration begins with minimum key of map.
+    If stop is None, iteration continues through the maximum key of map.
+    """
+    return self.snapshot().find_range(start, stop)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# Read-only sorted map with the interface of the sorted maps of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import ItemsView, ValuesView
+import copyreg
+from itertools import accumulate
+import pickle
+
+from .map_base import MapBase
+
+def _pack_strings(strings):
+  """Return the strings packed in UTF-8 in a single bytes object, and an array with their offsets."""
+  encoded = [k.encode('utf-8', 'surrogatepass') for k in strings]
+  return b''.join(encoded), array('Q', accumulate((len(k) for k in encoded), initial=0))
+
+def _unpack_strings(data, offsets):
+  """Return the list of strings packed by _pack_strings (data and offsets may be any buffers)."""
+  data, offsets = memoryview(data), memoryview(offsets).cast('B').cast('Q')
+  return [str(data[offsets[i]:offsets[i + 1]], 'utf-8', 'surrogatepass') for i in range(len(offsets) - 1)]
+
+
+class FrozenMap(MapBase):
+  """Immutable sorted map implementation using two sorted arrays (keys and values).
+
+  There are no nodes nor items: the values are in one contiguous list and the keys
+  in an array of machine integers or floats (see _pack), or else in a list, and the
+  searches are binary searches on the keys. String keys stay in a list of the str objects
+  themselves (lookups compare them in C, and interned keys are shared, not copied);
+  they are only packed in UTF-8 when the map is pickled.
+  """
+
+  #------------------------- views that iterate over the arrays -------------------------
+  class _ItemsView(ItemsView):
+    def __iter__(self):
+      return zip(self._mapping._keys, self._mapping._values)
+
+    def __reversed__(self):
+      return zip(reversed(self._mapping._keys), reversed(self._mapping._values))
+
+  class _ValuesView(ValuesView):
+    def __iter__(self):
+      return iter(self._mapping._values)
+
+    def __reversed__(self):
+      return reversed(self._mapping._values)
+
+  def __init__(self, keys=(), values=()):
+    """Create a map with the given keys (in strictly increasing order) and their values."""
+    self._keys = list(keys)
+    self._values = list(values)
+    if len(self._keys) != len(self._values):
+      raise ValueError('There must be a value for each key')
+    for i in range(1, len(self._keys)):
+      if not self._keys[i - 1] < self._keys[i]:
+        raise ValueError('Keys must be in strictly increasing order')
+    self._keys = self._pack(self._keys)
+
+  @staticmethod
+  def _pack(keys):
+    """Return the keys in the most compact column for their type."""
+    if keys and all(type(k) is int for k in keys) and -2**63 <= keys[0] and keys[-1] < 2**63:
+      return array('q', keys)
+    if keys and all(type(k) is float for k in keys):
+      return array('d', keys)
+    return keys
+
+  @classmethod
+  def from_sorted(cls, items):
+    """Return a new map with an iterable of (key,value) pairs in strictly increasing order of key."""
+    pairs = list(items)
+    return cls((k for k, v in pairs), (v for k, v in pairs))
+
+  #-------------------------- pickling support --------------------------
+  def __reduce_ex__(self, protocol):
+    """Pickle the map with its string keys packed in two buffers (UTF-8 bytes and their offsets).
+
+    With protocol 5 the buffers can be sent out-of-band. The keys are not checked again when loaded.
+    """
+    keys = self._keys
+    if keys and type(keys) is list and all(type(k) is str for k in keys):
+      keys = _pack_strings(keys)
+      if protocol >= 5:
+        keys = tuple(pickle.PickleBuffer(buffer) for buffer in keys)
+    return (copyreg.__newobj__, (type(self),), (keys, self._values))
+
+  def __setstate__(self, state):
+    keys, self._values = state
+    self._keys = _unpack_strings(*keys) if isinstance(keys, tuple) else keys
+
+  #--------------------- public methods for (standard) map interface ---------------------
+  def __len__(self):
+    """Return the total number of items in the map."""
+    return len(self._keys)
+
+  def _index(self, k):
+    """Return the index of key k, or None if not found."""
+    i = bisect_left(self._keys, k)
+    return i if i < len(self._keys) and self._keys[i] == k else None
+
+  def __getitem__(self, k):
+    """Return value associated with key k (raise KeyError if not found)."""
+    i = self._index(k)
+    if i is None:
+      raise KeyError('Key Error: ' + repr(k))
+    return self._values[i]
+
+  def get(self, k, default=None):
+    """Return value associated with key k, or default if not found."""
+    i = self._index(k)
+    return self._values[i] if i is not None else default
+
+  def __contains__(self, k):
+    """Return True if the map has key k."""
+    return self._index(k) is not None
+
+  def __setitem__(self, k, v):
+    raise TypeError('Frozen maps are read-only')
+
+  def __delitem__(self, k):
+    raise TypeError('Frozen maps are read-only')
+
+  def __iter__(self):
+    """Generate an iteration of all keys in the map in order."""
+    return iter(self._keys)
+
+  def items(self):
+    """Return a view of the (key,value) pairs in key order."""
+    return self._ItemsView(self)
+
+  def values(self):
+    """Return a view of the values in key order."""
+    return self._ValuesView(self)
+
+  #--------------------- public methods for sorted map interface ---------------------
+  def __reversed__(self):
+    """Generate an iteration of all keys in the map in reverse order."""
+    return reversed(self._keys)
+
+  def _pair(self, i):
+    return (self._keys[i], self._values[i]) if 0 <= i < len(self._keys) else None
+
+  def find_min(self):
+    """Return (key,value) pair with minimum key (or None if empty)."""
+    return self._pair(0)
+
+  def find_max(self):
+    """Return (key,value) pair with maximum key (or None if empty)."""
+    return self._pair(len(self._keys) - 1)
+
+  def find_le(self, k):
+    """Return (key,value) pair with greatest key less than or equal to k (or None)."""
+    return self._pair(bisect_right(self._keys, k) - 1)
+
+  def find_lt(self, k):
+    """Return (key,value) pair with greatest key strictly less than k (or None)."""
+    return self._pair(bisect_left(self._keys, k) - 1)
+
+  def find_ge(self, k):
+    """Return (key,value) pair with least key greater than or equal to k (or None)."""
+    return self._pair(bisect_left(self._keys, k))
+
+  def find_gt(self, k):
+    """Return (key,value) pair with least key strictly greater than k (or None)."""
+    return self._pair(bisect_right(self._keys, k))
+
+  def find_range(self, start, stop):
+    """Iterate all (key,value) pairs such that start <= key < stop.
+
+    If start is None, iteration begins with minimum key of map.
+    If stop is None, iteration continues through the maximum key of map.
+    """
+    low = bisect_left(self._keys, start) if start is not None else 0
+    high = bisect_left(self._keys, stop) if stop is not None else len(self._keys)
+    for i in range(low, high):
+      yield (self._keys[i], self._values[i])
@@ -19,6 +19,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copyreg
+import pickle
+
 from .positional_binary_tree import PositionalBinaryTree
 
 class LinkedPositionalBinaryTree(PositionalBinaryTree):
@@ -27,13 +30,14 @@ class LinkedPositionalBinaryTree(PositionalBinaryTree):
   #-------------------------- nested _Node class --------------------------
   class _Node:
     """Lightweight, nonpublic class for storing a node."""
-    __slots__ = '_element', '_parent', '_left', '_right' # streamline memory usage
+    __slots__ = '_element', '_parent', '_left', '_right', '_position' # streamline memory usage
 
     def __init__(self, element, parent=None, left=None, right=None):
       self._element = element
       self._parent = parent
       self._left = left
       self._right = right
+      self._position = None          # cached Position, created when it is first needed
 
   #-------------------------- nested Position class --------------------------
   class Position(PositionalBinaryTree.Position):
@@ -50,7 +54,7 @@ class LinkedPositionalBinaryTree(PositionalBinaryTree):
 
     def __eq__(self, other):
       """Return True if other is a Position representing the same location."""
-      return type(other) is type(self) and other._node is self._node
+      return other is self or (type(other) is type(self) and other._node is self._node)
 
   #------------------------------- utility methods -------------------------------
   def _validate(self, p):
@@ -64,8 +68,16 @@ class LinkedPositionalBinaryTree(PositionalBinaryTree):
     return p._node
 
   def _make_position(self, node):
-    """Return Position instance for given node (or None if no node)."""
-    return self.Position(self, node) if node is not None else None
+    """Return Position instance for given node (or None if no node).
+
+    Each node caches its Position, so the same object is returned for the same node.
+    """
+    if node is None:
+      return None
+    p = node._position
+    if p is None or p._container is not self:  # not created yet, or node moved from another tree
+      p = node._position = self.Position(self, node)
+    return p
 
   #-------------------------- binary tree constructor --------------------------
   def __init__(self):
@@ -199,3 +211,54 @@ class LinkedPositionalBinaryTree(PositionalBinaryTree):
       node._right = t2._root
       t2._root = None             # set t2 instance to empty
       t2._size = 0
+
+  #-------------------------- pickling support --------------------------
+  def __reduce_ex__(self, protocol):
+    """Pickle the tree as flat sequences instead of the graph of linked nodes.
+
+    The object is created again without calling __init__ and its state is given to __setstate__.
+    """
+    return (copyreg.__newobj__, (type(self),), self._flat_state(protocol))
+
+  def _attributes(self):
+    """Return the attributes of the tree other than its nodes."""
+    return {name: value for name, value in vars(self).items() if name not in ('_root', '_size')}
+
+  def _flat_state(self, protocol):
+    """Return (attributes, elements in preorder, shape) with a byte per node for its children."""
+    elements = []
+    shape = bytearray()
+    stack = [self._root] if self._root is not None else []
+    while stack:
+      node = stack.pop()
+      elements.append(node._element)
+      shape.append((node._left is not None) | (node._right is not None) << 1)
+      if node._right is not None:         # left subtree is visited first
+        stack.append(node._right)
+      if node._left is not None:
+        stack.append(node._left)
+    shape = bytes(shape)
+    return (self._attributes(), elements, pickle.PickleBuffer(shape) if protocol >= 5 else shape)
+
+  def __setstate__(self, state):
+    """Rebuild the tree from the state returned by _flat_state in O(n) time."""
+    attributes, elements, shape = state
+    self.__dict__.update(attributes)
+    self._root = None
+    self._size = len(elements)
+    shape = memoryview(shape)
+    stack = []                            # nodes whose right child is still expected
+    for i, element in enumerate(elements):
+      if stack:
+        parent, side = stack.pop()
+        node = self._Node(element, parent)
+        if side == 'left':
+          parent._left = node
+        else:
+          parent._right = node
+      else:
+        node = self._root = self._Node(element)
+      if shape[i] & 2:
+        stack.append((node, 'right'))
+      if shape[i] & 1:
+        stack.append((node, 'left'))
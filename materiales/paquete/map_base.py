@@ -42,3 +42,26 @@ class MapBase(MutableMapping, ABC):
 
     def __lt__(self, other):               
       return self._key < other._key    # compare items based on their keys
+
+  #------------------------------- nonpublic utilities -------------------------------
+  @staticmethod
+  def _sorted_pairs(items, sort):
+    """Return a list with the (key,value) pairs of items in strictly increasing order of key.
+
+    Raise ValueError if sort is False and the keys are not strictly increasing.
+    If sort is True, the pairs are sorted and only the last value of a repeated key is kept.
+    """
+    items = list(items)
+    if sort:
+      items.sort(key=lambda item: item[0])         # stable, so repeated keys keep their order
+      unique = []
+      for item in items:
+        if unique and not unique[-1][0] < item[0]: # same key as previous pair: last one wins
+          unique[-1] = item
+        else:
+          unique.append(item)
+      return unique
+    for i in range(1, len(items)):
+      if not items[i - 1][0] < items[i][0]:
+        raise ValueError('Keys must be in strictly increasing order')
+    return items
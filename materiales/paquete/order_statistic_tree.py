@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# Order statistic tree built on top of the AVL tree of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from .avl_tree import AVL
+
+class OrderStatisticAVL(AVL):
+  """Sorted map implementation using an AVL tree that uses the size of the subtrees.
+
+  The sizes that AVL nodes keep allow reaching the item of any rank (select)
+  and counting the keys of a range (rank, count_range) in O(log n).
+  """
+
+  #--------------------- public methods for order statistics ---------------------
+  def select(self, i):
+    """Return the Position of the item with rank i (the i-th smallest key, starting from 0).
+
+    Raise IndexError if i is not in range(len(self)).
+    """
+    if not 0 <= i < len(self):
+      raise IndexError('Index out of range')
+    node = self._root
+    while True:
+      left = node.left_count()
+      if i < left:                          # item is in the left subtree
+        node = node._left
+      elif i == left:                       # item is this one
+        return self._make_position(node)
+      else:                                 # skip left subtree and this node
+        i -= left + 1
+        node = node._right
+
+  def rank(self, k):
+    """Return the number of keys strictly less than k."""
+    count = 0
+    node = self._root
+    while node is not None:
+      if node._element._key < k:            # node and its left subtree are smaller
+        count += node.left_count() + 1
+        node = node._right
+      else:
+        node = node._left
+    return count
+
+  def count_range(self, start, stop):
+    """Return the number of keys such that start <= key < stop.
+
+    If start is None, the count begins with minimum key of map.
+    If stop is None, the count continues through the maximum key of map.
+    """
+    low = self.rank(start) if start is not None else 0
+    high = self.rank(stop) if stop is not None else len(self)
+    return max(0, high - low)
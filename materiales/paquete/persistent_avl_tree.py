@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# Persistent AVL tree (path copying) built on top of the AVL tree of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from itertools import count
+
+from .avl_tree import AVL
+from .binary_search_tree import BST
+from .map_base import MapBase
+
+_epochs = count(1)                # versions are unique among all the trees
+
+class PersistentAVL(AVL):
+  """Sorted map implementation using an AVL tree that can take snapshots of its items.
+
+  snapshot() takes O(1) time. Each node knows the version (epoch) of the tree in which it
+  was created, and the nodes of older versions are shared with the snapshots, so a mutation
+  first copies the O(log n) nodes that it changes. Snapshots never read the parent of a node,
+  so the parents of shared nodes can be updated to point to the copies.
+  """
+
+  #-------------------------- nested _Node class --------------------------
+  class _Node(AVL._Node):
+    """Node class for persistent AVL knows the version of the tree in which it was created."""
+    __slots__ = '_epoch'          # additional data member to store version
+
+    def __init__(self, element, parent=None, left=None, right=None):
+      super().__init__(element, parent, left, right)
+      self._epoch = 0             # set by the tree when the node is added
+
+  def __init__(self):
+    """Create an initially empty tree."""
+    super().__init__()
+    self._epoch = next(_epochs)
+    self._shared = False          # True if some node may belong to a snapshot
+
+  def __setstate__(self, state):
+    attributes, keys, values = state
+    # the nodes are rebuilt in a new version (_rebalance_bulk stamps them with it)
+    attributes = dict(attributes, _epoch=next(_epochs), _shared=False)
+    super().__setstate__((attributes, keys, values))
+
+  #------------------------------- snapshots -------------------------------
+  def snapshot(self):
+    """Return a read-only AVLSnapshot with the current items of the map in O(1) time."""
+    snapshot = AVLSnapshot(self._root, self._size)
+    self._epoch = next(_epochs)   # all current nodes become shared
+    self._shared = True
+    return snapshot
+
+  #------------------------- nonpublic utilities for copying -------------------------
+  def _own(self, node):
+    """Return node if it belongs to the current version, or else a copy that replaces it."""
+    if node._epoch == self._epoch:
+      return node
+    parent = node._parent
+    if parent is not None:
+      parent = self._own(parent)             # parent must point to the copy
+    item = self._Item(node._element._key, node._element._value)
+    copy = self._Node(item, parent, node._left, node._right)
+    copy._height = node._height
+    copy._count = node._count
+    copy._epoch = self._epoch
+    if parent is None:
+      self._root = copy
+    elif parent._left is node:
+      parent._left = copy
+    else:
+      parent._right = copy
+    for child in (copy._left, copy._right):
+      if child is not None:
+        child._parent = copy
+    node._parent = node                      # convention for deprecated node
+    return copy
+
+  def _own_path(self, k):
+    """Copy the shared nodes of the search path of key k and return the last one."""
+    node = self._root
+    if not self._shared:
+      return self._search(node, k) if node is not None else None
+    while node is not None:
+      node = self._own(node)
+      key = node._element._key
+      if k == key:
+        return node
+      child = node._left if k < key else node._right
+      if child is None:
+        return node
+      node = child
+    return None
+
+  def _own_all(self):
+    """Copy all the shared nodes (before the tree is relinked as a whole)."""
+    if self._shared:
+      stack = [self._root] if self._root is not None else []
+      while stack:                           # parents are copied before their children
+        node = self._own(stack.pop())
+        stack.extend(child for child in (node._left, node._right) if child is not None)
+      self._shared = False
+
+  #---------------------------- override mutators ----------------------------
+  def __setitem__(self, k, v):
+    self._own_path(k)
+    super().__setitem__(k, v)
+
+  def delete(self, p):
+    node = self._own_path(self._validate(p)._element._key)
+    if node._left is not None and node._right is not None:
+      walk = self._own(node._left)           # replacement item is also copied
+      while walk._right is not None:
+        walk = self._own(walk._right)
+    super().delete(self._make_position(node))
+
+  def update_many(self, items, sort=False):
+    items = list(items)
+    if not self._few_changes(len(items)):
+      self._own_all()                        # all nodes are relinked
+    super().update_many(items, sort)
+
+  def delete_many(self, keys, sort=False):
+    keys = list(keys)
+    if not self._few_changes(len(keys)):
+      self._own_all()                        # all nodes are relinked
+    super().delete_many(keys, sort)
+
+  def _release(self):
+    self._own_all()                          # nodes are moved to another tree
+    return super()._release()
+
+  def _acquire(self, root, size):
+    super()._acquire(root, size)
+    self._shared = True                      # moved nodes keep the version of their old tree
+
+  #---------------------------- override balancing hooks ----------------------------
+  def _restructure(self, x):
+    # after a deletion the trinode may be out of the copied path
+    return super()._restructure(self._make_position(self._own(x._node)))
+
+  def _rebalance_insert(self, p):
+    p._node._epoch = self._epoch
+    super()._rebalance_insert(p)
+
+  def _rebalance_bulk(self, node, n):
+    node._epoch = self._epoch
+    super()._rebalance_bulk(node, n)
+
+
+class AVLSnapshot(MapBase):
+  """Read-only sorted map with the items that a PersistentAVL had when the snapshot was taken.
+
+  It shares the nodes of the tree and visits them without parent references.
+  """
+
+  # the node-based lookups and iterators of BST do not use parents or positions
+  _ItemsView = BST._ItemsView
+  _ValuesView = BST._ValuesView
+  _search = BST._search
+  _subtree_nodes = BST._subtree_nodes
+  _inorder_nodes = BST._inorder_nodes
+  _reversed_nodes = BST._reversed_nodes
+  get = BST.get
+  __contains__ = BST.__contains__
+  __iter__ = BST.__iter__
+  __reversed__ = BST.__reversed__
+  items = BST.items
+  values = BST.values
+  find_range = BST.find_range
+
+  def __init__(self, root, size):
+    """Create a snapshot of the subtree root, which has size nodes (it should not be invoked by user)."""
+    self._root = root
+    self._size = size
+
+  def __len__(self):
+    """Return the total number of items in the snapshot."""
+    return self._size
+
+  def __getitem__(self, k):
+    """Return value associated with key k (raise KeyError if not found)."""
+    if self._root is not None:
+      node = self._search(self._root, k)
+      if node._element._key == k:
+        return node._element._value
+    raise KeyError('Key Error: ' + repr(k))
+
+  def __setitem__(self, k, v):
+    raise TypeError('Snapshots are read-only')
+
+  def __delitem__(self, k):
+    raise TypeError('Snapshots are read-only')
+
+  def _pair(self, node):
+    return (node._element._key, node._element._value) if node is not None else None
+
+  def find_min(self):
+    """Return (key,value) pair with minimum key (or None if empty)."""
+    node = self._root
+    while node is not None and node._left is not None:
+      node = node._left
+    return self._pair(node)
+
+  def find_max(self):
+    """Return (key,value) pair with maximum key (or None if empty)."""
+    node = self._root
+    while node is not None and node._right is not None:
+      node = node._right
+    return self._pair(node)
+
+  def _find_below(self, k, strict):
+    best = None
+    node = self._root
+    while node is not None:
+      key = node._element._key
+      if key < k or (not strict and key == k):
+        best = node                          # candidate, look for a greater one
+        node = node._right
+      else:
+        node = node._left
+    return self._pair(best)
+
+  def _find_above(self, k, strict):
+    best = None
+    node = self._root
+    while node is not None:
+      key = node._element._key
+      if k < key or (not strict and key == k):
+        best = node                          # candidate, look for a lower one
+        node = node._left
+      else:
+        node = node._right
+    return self._pair(best)
+
+  def find_le(self, k):
+    """Return (key,value) pair with greatest key less than or equal to k (or None)."""
+    return self._find_below(k, False)
+
+  def find_lt(self, k):
+    """Return (key,value) pair with greatest key strictly less than k (or None)."""
+    return self._find_below(k, True)
+
+  def find_ge(self, k):
+    """Return (key,value) pair with least key greater than or equal to k (or None)."""
+    return self._find_above(k, False)
+
+  def find_gt(self, k):
+    """Return (key,value) pair with least key strictly greater than k (or None)."""
+    return self._find_above(k, True)
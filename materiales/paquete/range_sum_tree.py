@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+#
+# Range sum tree built on top of the AVL tree of the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+
+from .order_statistic_tree import OrderStatisticAVL
+
+class RangeSumAVL(OrderStatisticAVL):
+  """Sorted map implementation using an AVL tree whose nodes know the sums of their subtree.
+
+  The sums are kept for the numeric attributes of the values named in fields,
+  so sum_range answers the sum of a range of keys in O(log n).
+  """
+
+  FIELDS = ()                     # attributes summed when the tree is created without fields
+
+  #-------------------------- nested _Node class --------------------------
+  class _Node(OrderStatisticAVL._Node):
+    """Node class for range sum AVL maintains the sums of the fields of its subtree."""
+    __slots__ = '_sums'           # additional data member to store subtree sums
+
+    def __init__(self, element, parent=None, left=None, right=None):
+      super().__init__(element, parent, left, right)
+      self._sums = None           # will be recomputed during balancing
+
+  def __init__(self, fields=None):
+    """Create an initially empty tree that sums the attributes named in fields."""
+    super().__init__()
+    self._fields = tuple(fields) if fields is not None else tuple(self.FIELDS)
+
+  def _empty_like(self):
+    return type(self)(self._fields)
+
+  def _check_type(self, other):
+    super()._check_type(other)
+    if self._fields != other._fields:         # sums of the nodes of other would be wrong
+      raise ValueError('Fields of the trees must match')
+
+  #------------------------- positional-based utility methods -------------------------
+  def _recompute_node(self, node):
+    super()._recompute_node(node)
+    value = node._element._value
+    sums = [getattr(value, field) for field in self._fields]
+    for child in (node._left, node._right):
+      if child is not None:
+        sums = [a + b for a, b in zip(sums, child._sums)]
+    node._sums = sums
+
+  def _recompute_ancestors(self, node):
+    while node is not None:                 # sums change up to the root
+      self._recompute_node(node)
+      node = node._parent
+
+  def _rebalance_bulk(self, node, n):
+    super()._rebalance_bulk(node, n)
+    self._recompute_node(node)              # children are linked before their parent
+
+  def __setitem__(self, k, v):
+    n = len(self)
+    super().__setitem__(k, v)
+    if len(self) == n:                      # value replaced: sums of its ancestors change
+      node = self._subtree_search(self.root(), k)._node
+      while node is not None:
+        self._recompute_node(node)
+        node = node._parent
+
+  #--------------------- public methods for range sums ---------------------
+  def sum_range(self, start, stop, field):
+    """Return the sum of attribute field of the values whose keys are such that start <= key < stop.
+
+    If start is None, the sum begins with minimum key of map.
+    If stop is None, the sum continues through the maximum key of map.
+    Raise ValueError if field is not one of the fields of the tree.
+    """
+    if field not in self._fields:
+      raise ValueError('Field not summed by the tree: ' + repr(field))
+    i = self._fields.index(field)
+    node = self._root
+    while node is not None:                 # find highest node inside the range
+      key = node._element._key
+      if start is not None and key < start:
+        node = node._right
+      elif stop is not None and not key < stop:
+        node = node._left
+      else:
+        break
+    if node is None:
+      return 0
+    total = getattr(node._element._value, field)
+    walk = node._left                       # keys >= start of the left subtree
+    while walk is not None:
+      if start is None or not walk._element._key < start:
+        total += getattr(walk._element._value, field)
+        if walk._right is not None:         # whole right subtree is inside the range
+          total += walk._right._sums[i]
+        walk = walk._left
+      else:
+        walk = walk._right
+    walk = node._right                      # keys < stop of the right subtree
+    while walk is not None:
+      if stop is None or walk._element._key < stop:
+        total += getattr(walk._element._value, field)
+        if walk._left is not None:          # whole left subtree is inside the range
+          total += walk._left._sums[i]
+        walk = walk._right
+      else:
+        walk = walk._left
+    return total
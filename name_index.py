@@ -0,0 +1,103 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+from course import Course
+from paquete.avl_tree import AVL
+from paquete.b_tree import BTree
+
+class NameIndex:
+    """Secondary index that stores the courses of an academy ordered by their name.
+
+    The courses are stored in a B+ tree whose keys are (name, level, language) tuples,
+    so all the courses whose name starts with the same prefix are together in the tree.
+
+    Attributes
+    ----------
+    tree: BTree
+        Tree that maps (name, level, language) to each course.
+
+    Methods
+    -------
+    add(course):
+        Adds a course to the index.
+
+    with_prefix(prefix):
+        Generates all the courses whose name starts with prefix.
+
+    name_collision(course):
+        Checks if there is another course whose name starts with the name of course.
+    """
+
+    def __init__(self, academy: AVL = None):
+        """Creates the index with the courses of 'academy' (empty if academy is None).
+
+        Parameters
+        ----------
+        academy: AVL
+            Tree (or dictionary) with the courses of an academy.
+
+        Returns
+        -------
+        None.
+        """
+        courses = academy.values() if academy is not None else ()
+        self._tree = BTree.from_sorted((((course.name, course.level, course.language), course) for course in courses), sort=True)
+
+    def __len__(self):
+        """Returns the number of courses in the index."""
+        return len(self._tree)
+
+    def add(self, course: Course):
+        """Adds a course to the index (replaces the same course if it was already there).
+
+        Parameters
+        ----------
+        course: Course
+            Course to be added.
+
+        Returns
+        -------
+        None.
+        """
+        self._tree[(course.name, course.level, course.language)] = course
+
+    def with_prefix(self, prefix: str):
+        """Generates all the courses whose name starts with 'prefix', ordered by name.
+
+        It takes O(log n + k), where k is the number of courses generated.
+
+        Parameters
+        ----------
+        prefix: str
+            Beginning of the name of the courses.
+
+        Returns
+        -------
+        generator
+            Yields Course objects.
+        """
+        # (prefix,) is lower than any (name, level, language) with name >= prefix
+        for key, course in self._tree.find_range((prefix,), None):
+            if not key[0].startswith(prefix): # There are no more names with this prefix
+                return
+            yield course
+
+    def name_collision(self, course: Course) -> bool:
+        """Checks if there is a course in the index with the same name (but not language and level).
+
+        Like in add_courses, the names of the index only need to start with the name of the course.
+
+        Parameters
+        ----------
+        course: Course
+            Course whose name is searched.
+
+        Returns
+        -------
+        bool
+            True if another course starts with the name of 'course'.
+        """
+        for other_course in self.with_prefix(course.name):
+            if not (course == other_course):
+                return True
+        return False
@@ -0,0 +1,58 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+
+import pytest
+
+from academy_file import AcademyFile
+from course import Course
+from paquete.avl_tree import AVL
+
+def academy(n):
+    rng = random.Random(n)
+    tree = AVL()
+    for _ in range(n):
+        course = Course(rng.choice(["Py", "Python", "Python_B1", "Java", "Español"]), rng.randint(1, 50), rng.randint(1, 30),
+                        rng.choice(["A1", "B1", "C1", "B1_C1"]), rng.choice(["English", "Spanish"]), rng.choice([1.0, 2.5]))
+        tree[course.key()] = course
+    return tree
+
+def test_write_read(tmp_path):
+    tree = academy(300)
+    file_name = tmp_path / "academy.bin"
+    AcademyFile.write(tree, file_name)
+    with AcademyFile(file_name) as courses:
+        assert len(courses) == len(tree)
+        assert list(courses) == list(tree)
+        for row, (key, course) in enumerate(tree.items()):
+            assert courses.row(key) == row
+            assert key in courses
+            assert str(courses[key]) == str(course)
+            assert courses[key].benefit == course.benefit
+        assert list(courses.column("price")) == [course.price for course in tree.values()]
+        assert courses.total_benefit() == pytest.approx(sum(course.benefit for course in tree.values()))
+        keys = list(tree)
+        start, stop = keys[10], keys[-10]
+        assert [key for key, view in courses.find_range(start, stop)] == [key for key, course in tree.find_range(start, stop)]
+        assert [key for key, view in courses.find_range(None, None)] == keys
+        assert "Python_B1_C1_English" not in courses
+        with pytest.raises(KeyError):
+            courses["Python_B1_C1_English"]
+
+def test_empty_academy(tmp_path):
+    file_name = tmp_path / "empty.bin"
+    AcademyFile.write(AVL(), file_name)
+    with AcademyFile(file_name) as courses:
+        assert len(courses) == 0
+        assert list(courses.find_range(None, None)) == []
+        assert courses.total_benefit() == 0
+
+def test_other_version_is_rejected(tmp_path):
+    file_name = tmp_path / "old.bin"
+    AcademyFile.write(academy(20), file_name)
+    data = bytearray(file_name.read_bytes())
+    data[4:8] = (AcademyFile.VERSION - 1).to_bytes(4, "little")   # header: magic, version (little endian)
+    file_name.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        AcademyFile(file_name)
@@ -0,0 +1,59 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+
+import pytest
+
+from course import Course
+from main import added_offer, added_offer_many
+from paquete.avl_tree import AVL
+
+NAMES = ("Academy A", "Academy B", "Academy C")
+
+def academy(courses):
+    tree = AVL()
+    for course in courses:
+        tree[course.key()] = course
+    return tree
+
+def random_academy(rng, n):
+    return academy(Course(rng.choice(["Py", "Python", "Python_B1", "Java", "Ja"]), rng.randint(1, 50), rng.randint(1, 30),
+                          rng.choice(["A1", "B1", "C1", "B1_C1"]), rng.choice(["English", "Spanish"]), rng.choice([1.0, 2.5]))
+                   for _ in range(n))
+
+def dump(tree):
+    return [(key, str(course)) for key, course in tree.items()]
+
+@pytest.mark.parametrize("seed", range(50))
+def test_two_academies_as_added_offer(seed):
+    rng = random.Random(seed)
+    tree_A, tree_B = random_academy(rng, rng.randint(0, 20)), random_academy(rng, rng.randint(0, 20))
+    assert dump(added_offer_many([tree_A, tree_B], NAMES[:2])) == dump(added_offer(tree_A, tree_B, NAMES[:2]))
+
+def test_empty_academies_change_nothing():
+    tree_A = academy([Course("Ja", 10, 5, "A1", "English", 2.0), Course("Ja", 10, 5, "B1", "English", 2.0)])
+    tree_B = academy([Course("Py A", 10, 5, "A1", "English", 2.0), Course("Py", 10, 5, "B1", "English", 2.0)])
+    expected = dump(added_offer(tree_A, tree_B, NAMES[:2]))
+    assert "Py Academy B_B1_English" in [course.label() for course in added_offer(tree_A, tree_B, NAMES[:2]).values()]
+    assert dump(added_offer_many([tree_A, tree_B, AVL()], NAMES)) == expected
+    rng = random.Random(0)
+    for _ in range(50):
+        trees = [random_academy(rng, rng.randint(0, 15)) for _ in range(3)]
+        expected = dump(added_offer_many(trees, NAMES))
+        assert dump(added_offer_many(trees + [AVL()], NAMES + ("Academy D",))) == expected
+        assert dump(added_offer_many([trees[0], AVL(), trees[1], trees[2]], NAMES[:1] + ("Academy D",) + NAMES[1:])) == expected
+
+def test_several_academies():
+    tree_A = academy([Course("Py", 10, 5, "B1", "English", 2.0), Course("Py", 10, 5, "C1", "Spanish", 2.0),
+                      Course("Java", 10, 5, "A1", "English", 2.0)])
+    tree_B = academy([Course("Py", 10, 5, "C1", "English", 2.0), Course("Java", 20, 3, "A1", "English", 2.0)])
+    tree_C = academy([Course("Go", 10, 5, "A1", "English", 2.0), Course("Go", 10, 5, "B1", "English", 2.0)])
+    added = added_offer_many([tree_A, tree_B, tree_C], NAMES)
+    assert sorted(course.label() for course in added.values()) == sorted([
+        "Py Academy A_B1_English", "Py Academy A_C1_Spanish", # Compared with the courses of B and C
+        "Py Academy B_C1_English",                            # Compared with the courses already added
+        "Go_A1_English", "Go Academy C_B1_English",           # Also with the ones of its own academy
+        "Java_A1_English"])
+    java = added[Course("Java", 1, 1, "A1", "English", 1.0).key()]
+    assert (java.duration, java.number_students) == (20, 8) # The most profitable one, with the students of both
@@ -0,0 +1,51 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.b_tree import BTree
+
+@pytest.mark.parametrize("order", [3, 4, 64])
+def test_same_results_as_avl(order):
+    rng = random.Random(order)
+    tree, avl = BTree(order), AVL()
+    for _ in range(3000):
+        k = rng.randrange(1000)
+        if rng.random() < 0.6:
+            tree[k] = avl[k] = rng.random()
+        elif k in avl:
+            del avl[k]
+            assert tree.pop(k) is not None
+        else:
+            assert tree.pop(k, "missing") == "missing"
+    assert list(tree.items()) == list(avl.items())
+    assert list(reversed(tree)) == list(reversed(avl))
+    for k in range(-1, 1002, 7):
+        for method in ("find_le", "find_lt", "find_ge", "find_gt"):
+            assert getattr(tree, method)(k) == getattr(avl, method)(k)
+        assert list(tree.find_range(k, k + 50)) == list(avl.find_range(k, k + 50))
+    assert tree.get_many(range(0, 1000, 3), -1) == avl.get_many(range(0, 1000, 3), -1)
+
+def test_positions():
+    tree = BTree.from_sorted(((k, str(k)) for k in range(0, 200, 2)), order=4)
+    p = tree.first()
+    keys = []
+    while p is not None:
+        keys.append(p.key())
+        p = tree.after(p)
+    assert keys == list(range(0, 200, 2))
+    assert tree.before(tree.last()).key() == 196
+    assert tree.find_key(3) is None and tree.find_key(4).value() == "4"
+    assert tree.find_position(5).key() in (4, 6)
+    tree.delete(tree.find_key(4))
+    assert 4 not in tree and len(tree) == 99
+    p = tree.find_key(6)
+    tree[7] = "7"
+    with pytest.raises(ValueError):
+        tree.delete(p) # Positions are not valid after a change
+    with pytest.raises(KeyError):
+        del tree[4]
+    assert BTree().first() is None and BTree().find_position(1) is None
@@ -0,0 +1,34 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.binary_search_tree import BST
+
+class AccessLog(BST):
+    """Tree that records the keys of the accessed positions."""
+
+    def __init__(self):
+        super().__init__()
+        self.accessed = []
+
+    def _rebalance_access(self, p):
+        self.accessed.append(p.key())
+
+@pytest.mark.parametrize("cls", [BST, AVL])
+def test_getitem_creates_no_positions(cls):
+    tree = cls.from_sorted((k, str(k)) for k in range(100))
+    assert [tree[k] for k in range(100)] == [str(k) for k in range(100)]
+    assert all(node._position is None for node in tree._subtree_nodes(tree._root))
+    with pytest.raises(KeyError):
+        tree[100]
+
+def test_getitem_calls_the_access_hook():
+    tree = AccessLog()
+    for k in (5, 2, 8):
+        tree[k] = k
+    assert tree[8] == 8
+    with pytest.raises(KeyError):
+        tree[3]
+    assert tree.accessed == [8, 2] # The last node of the search path
@@ -0,0 +1,90 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.binary_search_tree import BST
+from paquete.persistent_avl_tree import PersistentAVL
+from paquete.range_sum_tree import RangeSumAVL
+from test_join import check_avl
+
+CLASSES = [BST, AVL, PersistentAVL]
+
+def tree_of(cls, keys):
+    return cls.from_sorted((k, str(k)) for k in sorted(keys))
+
+@pytest.mark.parametrize("cls", CLASSES)
+@pytest.mark.parametrize("batch", [3, 400]) # Single operations and rebuild
+def test_update_many(cls, batch):
+    rng = random.Random(batch)
+    tree = tree_of(cls, rng.sample(range(2000), 500))
+    model = dict(tree.items())
+    items = [(k, -k) for k in rng.sample(range(2000), batch)]
+    tree.update_many(items, sort=True)
+    model.update(items)
+    assert list(tree.items()) == sorted(model.items())
+    if cls is not BST:
+        check_avl(tree)
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_update_many_keeps_positions(cls):
+    tree = tree_of(cls, range(0, 200, 2))
+    positions = [tree.find_position(k) for k in range(0, 200, 2)]
+    tree.update_many((k, "new") for k in range(200)) # Large batch: the tree is rebuilt
+    assert len(tree) == 200
+    for k, p in zip(range(0, 200, 2), positions):
+        assert p.key() == k and p.value() == "new"
+        assert tree.after(p).key() == k + 1
+    tree.delete(positions[10])
+    assert 20 not in tree and len(tree) == 199
+
+def test_update_many_order_and_repeated_keys():
+    tree = tree_of(AVL, range(10))
+    with pytest.raises(ValueError):
+        tree.update_many([(5, "a"), (3, "b")])
+    tree.update_many([(5, "a"), (3, "b"), (5, "c")], sort=True) # The last value is kept
+    assert tree[5] == "c" and tree[3] == "b"
+
+@pytest.mark.parametrize("cls", CLASSES)
+@pytest.mark.parametrize("batch", [3, 400])
+def test_delete_many(cls, batch):
+    rng = random.Random(batch)
+    tree = tree_of(cls, range(1000))
+    keys = rng.sample(range(1000), batch)
+    tree.delete_many(keys, sort=True)
+    assert list(tree) == sorted(set(range(1000)) - set(keys))
+    if cls is not BST:
+        check_avl(tree)
+
+@pytest.mark.parametrize("cls", CLASSES)
+@pytest.mark.parametrize("batch", [3, 400])
+def test_delete_many_missing_key_changes_nothing(cls, batch):
+    tree = tree_of(cls, range(0, 2000, 2))
+    items = list(tree.items())
+    keys = list(range(0, 2 * batch, 2)) + [2 * batch + 1] # The last key is missing
+    with pytest.raises(KeyError):
+        tree.delete_many(keys)
+    assert list(tree.items()) == items and len(tree) == len(items)
+    if cls is not BST:
+        check_avl(tree)
+
+@pytest.mark.parametrize("batch", [3, 400])
+def test_bulk_mutations_keep_the_sums(batch):
+    rng = random.Random(batch)
+    tree = RangeSumAVL(fields=("students",))
+    model = {k: SimpleNamespace(students=rng.randrange(100)) for k in rng.sample(range(2000), 600)}
+    tree.update_many(model.items(), sort=True)
+    changes = {k: SimpleNamespace(students=rng.randrange(100)) for k in rng.sample(range(2000), batch)}
+    tree.update_many(changes.items(), sort=True)
+    model.update(changes)
+    removed = rng.sample(sorted(model), batch)
+    tree.delete_many(removed, sort=True)
+    for k in removed:
+        del model[k]
+    for start, stop in ((None, None), (100, 1500), (700, 701)):
+        expected = sum(v.students for k, v in model.items() if (start is None or start <= k) and (stop is None or k < stop))
+        assert tree.sum_range(start, stop, "students") == expected
@@ -0,0 +1,64 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+import threading
+
+from paquete.concurrent_avl_tree import ConcurrentAVL
+
+def test_batch_operations():
+    tree = ConcurrentAVL()
+    tree[1] = 1
+    tree.delete_many([1, 2]) # Missing keys are ignored
+    assert len(tree) == 0
+    tree.update_many(((k, k) for k in range(100)))
+    tree.update_many([(5, "five"), (3, "three"), (5, "last")], sort=True)
+    assert tree[3] == "three" and tree[5] == "last"
+    tree.delete_many(range(-10, 200, 2))
+    assert list(tree) == list(range(1, 100, 2))
+    tree.delete_many([99, 1, 1000], sort=True)
+    assert list(tree) == list(range(3, 99, 2))
+
+def test_iteration_is_a_snapshot():
+    tree = ConcurrentAVL()
+    tree.update_many((k, k) for k in range(10))
+    keys = iter(tree)
+    items = tree.find_range(3, 6)
+    tree.delete_many(range(10))
+    tree[100] = 100
+    assert list(keys) == list(range(10))
+    assert list(items) == [(3, 3), (4, 4), (5, 5)]
+    assert list(tree) == [100]
+
+def test_readers_and_writer():
+    tree = ConcurrentAVL()
+    tree.update_many((k, k) for k in range(0, 2000, 2))
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        rng = random.Random(1)
+        for _ in range(3000):
+            k = rng.randrange(2000)
+            if k in tree:
+                del tree[k]
+            else:
+                tree[k] = k
+        tree.delete_many(range(0, 2000, 3))
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            keys = list(tree)
+            if keys != sorted(set(keys)):
+                errors.append(keys)
+            if any(not 100 <= k < 200 for k, _ in tree.find_range(100, 200)):
+                errors.append("range")
+
+    threads = [threading.Thread(target=reader) for _ in range(3)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(tree) == len(list(tree)) and not any(k % 3 == 0 for k in tree)
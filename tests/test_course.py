@@ -0,0 +1,25 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import pytest
+
+from course import Course, course_key
+
+def test_same_label_different_keys():
+    first = Course("Python_B1", 10, 5, "C1", "English", 2.0)
+    second = Course("Python", 10, 5, "B1_C1", "English", 2.0)
+    assert first.label() == second.label()
+    assert first.key() != second.key()
+    assert first.key() is course_key("Python_B1", "C1", "English")
+
+def test_keys_in_order_of_labels():
+    fields = [("Py", "A1", "English"), ("Py Ac", "A1", "English"), ("Py", "B1", "Spanish"), ("Python", "C1", "English")]
+    labels = sorted(f"{n}_{l}_{g}" for n, l, g in fields)
+    assert [key.split("\0")[0] for key in sorted(course_key(*f) for f in fields)] == labels
+
+@pytest.mark.parametrize("fields", [("Py\0thon", "B1", "English"), ("Python", "B\0", "English"), ("Python", "B1", "\0")])
+def test_nul_is_rejected(fields):
+    with pytest.raises(ValueError):
+        course_key(*fields)
+    with pytest.raises(ValueError):
+        Course(fields[0], 10, 5, fields[1], fields[2], 2.0)
@@ -0,0 +1,39 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import pytest
+
+from course import Course
+from course_table import CourseTable
+from paquete.avl_tree import AVL
+
+def academy():
+    tree = AVL()
+    for course in (Course("Python", 10, 5, "B1", "English", 2.0), Course("Python_B1", 10, 3, "C1", "English", 1.5),
+                   Course("Java", 20, 4, "A1", "Spanish", 3.0)):
+        tree[course.key()] = course
+    return tree
+
+def test_views_read_the_rows():
+    tree = academy()
+    table = CourseTable.from_academy(tree)
+    assert list(table.index) == list(tree)
+    for row, (key, course) in enumerate(tree.items()):
+        view = table[key]
+        assert table.row(key) == view.row == row
+        assert view.key() == key and view.label() == course.label() and str(view) == str(course)
+        assert view.key() is view.key() # Computed only once
+    assert list(table.column("benefit")) == [course.benefit for course in tree.values()]
+    assert table.total_benefit() == sum(course.benefit for course in tree.values())
+    assert table.group_mean("language", "number_students") == {"English": 4, "Spanish": 4}
+
+def test_add_replaces_the_row():
+    table = CourseTable.from_academy(academy())
+    course = Course("Java", 20, 10, "A1", "Spanish", 3.0)
+    row = table.row(course.key())
+    assert table.add(course) == row and len(table) == 3
+    assert table[course.key()].number_students == 10
+    assert table.add(Course("Go", 1, 1, "A1", "Galician", 1.0)) == 3
+    assert table.column("language")[3] == "Galician"
+    with pytest.raises(KeyError):
+        table["Rust_A1_English"]
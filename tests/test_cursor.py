@@ -0,0 +1,61 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+from bisect import bisect_left
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.binary_search_tree import BST
+
+@pytest.mark.parametrize("cls", [BST, AVL])
+def test_seek_like_bisect(cls):
+    rng = random.Random(1)
+    keys = sorted(rng.sample(range(3000), 600))
+    tree = cls.from_sorted((k, -k) for k in keys)
+    cursor = tree.cursor()
+    assert cursor.key() == keys[0]
+    for k in [rng.randrange(-10, 3010) for _ in range(500)] + list(range(0, 3000, 7)):
+        found = cursor.seek(k)
+        i = bisect_left(keys, k)
+        assert found == (i < len(keys) and keys[i] == k)
+        if i < len(keys):
+            assert cursor and cursor.key() == keys[i] and cursor.value() == -keys[i]
+        else:
+            assert not cursor
+            cursor = tree.cursor(k) # The cursor is not on an item, a new one is taken
+            assert not cursor
+
+def test_next_and_prev():
+    tree = AVL.from_sorted((k, k) for k in range(10))
+    cursor = tree.cursor(5)
+    assert cursor.prev() and cursor.key() == 4
+    keys = [cursor.key()]
+    while cursor.next():
+        keys.append(cursor.key())
+    assert keys == list(range(4, 10)) and not cursor
+    assert not cursor.prev() # It stays off the items
+    with pytest.raises(ValueError):
+        cursor.key()
+    cursor = tree.cursor()
+    assert not cursor.prev()
+    assert not AVL().cursor() and not AVL().cursor(3)
+
+def test_seek_after_deletion():
+    tree = AVL.from_sorted((k, k) for k in range(100))
+    cursor = tree.cursor(50)
+    del tree[50]
+    assert not cursor.seek(50) and cursor.key() == 51 # Starts again from the root
+    assert cursor.seek(20) and cursor.key() == 20
+
+@pytest.mark.parametrize("cls", [BST, AVL])
+def test_get_many(cls):
+    rng = random.Random(2)
+    tree = cls.from_sorted((k, str(k)) for k in range(0, 1000, 3))
+    keys = [rng.randrange(-5, 1005) for _ in range(300)]
+    expected = [tree.get(k, "?") for k in keys]
+    assert tree.get_many(keys, "?") == expected
+    assert tree.get_many(sorted(keys), "?") == [tree.get(k, "?") for k in sorted(keys)]
+    assert tree.get_many([]) == []
+    assert cls().get_many([1, 2]) == [None, None]
@@ -0,0 +1,76 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import pickle
+import random
+import sys
+from array import array
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.frozen_map import FrozenMap
+
+def keys_of(kind, rng):
+    if kind == "str":
+        words = ["", "a", "ab", "ab\0", "abcdefgh", "abcdefghi", "abcdefgh\0z", "é", "\ud800", "zzzzzzzzzz", "Python_B1_English"]
+        return words + [f"course {rng.randrange(10**6)} {'x' * rng.randrange(12)}" for _ in range(500)]
+    if kind == "int":
+        return [-2**63, 2**63 - 1] + [rng.randrange(-10**9, 10**9) for _ in range(500)]
+    if kind == "float":
+        return [rng.uniform(-100, 100) for _ in range(500)]
+    return [(rng.randrange(50), rng.randrange(50)) for _ in range(500)]
+
+@pytest.mark.parametrize("kind", ["str", "int", "float", "tuple"])
+def test_same_results_as_avl(kind):
+    rng = random.Random(kind)
+    avl = AVL.from_sorted(((k, i) for i, k in enumerate(keys_of(kind, rng))), sort=True)
+    frozen = avl.freeze()
+    if kind in ("int", "float"):
+        assert type(frozen._keys) is array
+    assert list(frozen.items()) == list(avl.items())
+    assert list(reversed(frozen)) == list(reversed(avl))
+    keys = list(avl)
+    probes = keys_of(kind, rng)[:200] + keys[::5]
+    for k in probes:
+        assert frozen.get(k) == avl.get(k) and (k in frozen) == (k in avl)
+        for method in ("find_le", "find_lt", "find_ge", "find_gt"):
+            assert getattr(frozen, method)(k) == getattr(avl, method)(k)
+    for start, stop in zip(probes, reversed(probes)):
+        assert list(frozen.find_range(start, stop)) == list(avl.find_range(start, stop))
+    assert frozen.find_min() == avl.find_min() and frozen.find_max() == avl.find_max()
+
+def test_read_only_and_checks():
+    frozen = FrozenMap(["a", "b"], [1, 2])
+    with pytest.raises(TypeError):
+        frozen["c"] = 3
+    with pytest.raises(KeyError):
+        frozen["c"]
+    with pytest.raises(ValueError):
+        FrozenMap(["b", "a"], [1, 2])
+    assert len(FrozenMap()) == 0 and FrozenMap().find_min() is None
+
+def test_string_keys_are_not_copied():
+    keys = sorted(sys.intern(f"course {i}") for i in range(100))
+    frozen = FrozenMap(keys, range(100))
+    assert all(a is b for a, b in zip(frozen, keys))
+    assert all(a is b for (a, _), b in zip(frozen.find_range(None, None), keys))
+    assert frozen.find_ge("course 5")[0] is keys[keys.index("course 5")]
+
+@pytest.mark.parametrize("kind", ["str", "int", "float", "tuple"])
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(kind, protocol):
+    rng = random.Random(kind)
+    frozen = AVL.from_sorted(((k, i) for i, k in enumerate(keys_of(kind, rng))), sort=True).freeze()
+    copy = pickle.loads(pickle.dumps(frozen, protocol))
+    assert type(copy._keys) is type(frozen._keys)
+    assert list(copy.items()) == list(frozen.items())
+    assert all(copy[k] == v for k, v in frozen.items())
+
+def test_pickle_out_of_band():
+    frozen = FrozenMap(["a", "b\0", "é"], [1, 2, 3])
+    buffers = []
+    data = pickle.dumps(frozen, 5, buffer_callback=buffers.append)
+    assert len(buffers) == 2 # UTF-8 bytes and offsets of the keys
+    copy = pickle.loads(data, buffers=buffers)
+    assert list(copy.items()) == list(frozen.items())
@@ -0,0 +1,134 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from paquete.avl_tree import AVL
+from paquete.order_statistic_tree import OrderStatisticAVL
+from paquete.persistent_avl_tree import PersistentAVL
+from paquete.range_sum_tree import RangeSumAVL
+
+def check_avl(tree):
+    """Checks the order, heights, sizes and parents of all the nodes of an AVL tree."""
+    def check(node, low, high):
+        if node is None:
+            return 0, 0
+        key = node._element._key
+        assert (low is None or low < key) and (high is None or key < high)
+        left_height, left_count = check(node._left, low, key)
+        right_height, right_count = check(node._right, key, high)
+        assert abs(left_height - right_height) <= 1 and node._height == 1 + max(left_height, right_height)
+        assert node._count == 1 + left_count + right_count
+        for child in (node._left, node._right):
+            assert child is None or child._parent is node
+        return node._height, node._count
+    assert check(tree._root, None, None)[1] == len(tree)
+    assert tree._root is None or tree._root._parent is None
+
+def random_tree(cls, rng, n):
+    tree = cls()
+    for k in rng.sample(range(10 * n + 1), n):
+        tree[k] = str(k)
+    for k in rng.sample(list(tree), n // 3):
+        del tree[k]
+    return tree
+
+@pytest.mark.parametrize("cls", [AVL, OrderStatisticAVL, PersistentAVL])
+def test_split_and_join(cls):
+    rng = random.Random(1)
+    for n in (0, 1, 2, 10, 300):
+        tree = random_tree(cls, rng, n)
+        items = list(tree.items())
+        k = rng.randrange(-1, 10 * n + 2)
+        first, second = tree.split(k)
+        check_avl(first)
+        check_avl(second)
+        assert len(tree) == 0
+        assert list(first.items()) == [item for item in items if item[0] < k]
+        assert list(second.items()) == [item for item in items if item[0] >= k]
+        if second and second.find_min()[0] == k:
+            del second[k]
+        joined = cls.join(first, k, "k", second)
+        check_avl(joined)
+        assert list(joined) == sorted({key for key, _ in items} | {k})
+        assert len(first) == len(second) == 0
+
+def test_join_checks_keys_and_types():
+    with pytest.raises(ValueError):
+        AVL.join(AVL.from_sorted([(5, 5)]), 3, 3, AVL())
+    with pytest.raises(TypeError):
+        AVL.join(AVL(), 3, 3, PersistentAVL())
+
+@pytest.mark.parametrize("cls", [AVL, PersistentAVL])
+def test_set_operations(cls):
+    rng = random.Random(2)
+    for n, m in ((0, 5), (50, 50), (400, 20), (20, 400)):
+        a, b = random_tree(cls, rng, n), random_tree(cls, rng, m)
+        da, db = dict(a.items()), dict(b.items())
+        union, intersection, difference = cls.from_sorted(a.items()), cls.from_sorted(a.items()), cls.from_sorted(a.items())
+        union.union(cls.from_sorted(b.items()), combine=lambda x, y: x + y)
+        intersection.intersection(cls.from_sorted(b.items()))
+        other = cls.from_sorted(b.items())
+        difference.difference(other)
+        for tree in (union, intersection, difference):
+            check_avl(tree)
+        assert len(other) == 0 # The operand is consumed
+        assert dict(union.items()) == {k: da[k] + db[k] if k in da and k in db else da.get(k, db.get(k)) for k in da.keys() | db.keys()}
+        assert dict(intersection.items()) == {k: v for k, v in da.items() if k in db}
+        assert dict(difference.items()) == {k: v for k, v in da.items() if k not in db}
+
+def test_order_statistics_after_mutations():
+    rng = random.Random(3)
+    tree = random_tree(OrderStatisticAVL, rng, 500)
+    keys = list(tree)
+    check_avl(tree)
+    assert [tree.select(i).key() for i in range(len(keys))] == keys
+    assert tree.rank(keys[100]) == 100 and tree.count_range(keys[10], keys[20]) == 10
+
+@pytest.mark.parametrize("cls", [AVL, OrderStatisticAVL, PersistentAVL])
+def test_mutations_after_split_and_join(cls):
+    rng = random.Random(4)
+    for _ in range(100):
+        tree, model = cls(), {}
+        for _ in range(8):
+            for k in rng.sample(range(60), 4):
+                tree[k] = model[k] = rng.random()
+            snapshot = tree.snapshot() if cls is PersistentAVL else None
+            items = sorted(model.items())
+            k = rng.randrange(60)
+            first, second = tree.split(k)
+            operation = rng.choice(["union", "join"])
+            if operation == "join" and k not in model:
+                model[k] = "k"
+                tree = cls.join(first, k, "k", second)
+            else:
+                first.union(second)
+                tree = first
+            for k in rng.sample(list(model), len(model) // 3):
+                del tree[k]
+                del model[k]
+            check_avl(tree)
+            assert list(tree.items()) == sorted(model.items())
+            if snapshot is not None: # The snapshot is not changed by the moved nodes
+                assert list(snapshot.items()) == items
+
+def test_split_and_join_keep_the_fields():
+    values = {k: SimpleNamespace(students=k % 7, price=1.5) for k in range(200)}
+    tree = RangeSumAVL(fields=("students",))
+    tree.update_many(values.items())
+    first, second = tree.split(120)
+    assert first._fields == second._fields == ("students",)
+    assert first.sum_range(None, None, "students") == sum(values[k].students for k in range(120))
+    assert second.sum_range(130, 150, "students") == sum(values[k].students for k in range(130, 150))
+    del second[120]
+    joined = RangeSumAVL.join(first, 120, SimpleNamespace(students=100, price=0), second)
+    assert joined._fields == ("students",)
+    assert joined.sum_range(None, None, "students") == sum(v.students for v in values.values()) - values[120].students + 100
+    with pytest.raises(ValueError):
+        RangeSumAVL.join(RangeSumAVL(fields=("students",)), 5, values[5], RangeSumAVL(fields=("price",)))
+    with pytest.raises(ValueError):
+        joined.union(RangeSumAVL(fields=("price",)))
+    assert len(joined) == 200 # Nothing is moved if the fields do not match
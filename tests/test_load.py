@@ -0,0 +1,39 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+
+import pytest
+
+from main import CourseSimulator
+
+def write_courses(file_name, rng, n):
+    lines = ["name,duration,students,level,language,price"]
+    for _ in range(n):
+        lines.append(f"{rng.choice(['Py', 'Python', 'Java', 'Español'])},{rng.randint(1, 50)},{rng.randint(1, 30)},"
+                     f"{rng.choice(['A1', 'B1', 'C1'])},{rng.choice(['English', 'Spanish'])},{rng.choice([1.0, 2.5])}")
+        if rng.random() < 0.05:
+            lines.append("") # Empty lines are ignored
+    file_name.write_text("\n".join(lines) + "\n")
+
+def dump(tree):
+    return [(key, str(course)) for key, course in tree.items()]
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 8])
+def test_load_parallel_as_load(tmp_path, workers):
+    file_name = tmp_path / "courses.txt"
+    write_courses(file_name, random.Random(workers), 500) # Repeated courses: the last one is kept
+    simulator = CourseSimulator()
+    with open(file_name) as f:
+        expected = simulator.load(f)
+    academy = simulator.load_parallel(str(file_name), workers)
+    assert dump(academy) == dump(expected)
+    assert academy.stats.total_benefit() == pytest.approx(expected.stats.total_benefit())
+
+def test_load_parallel_small_files(tmp_path):
+    simulator = CourseSimulator()
+    file_name = tmp_path / "empty.txt"
+    file_name.write_text("")
+    assert len(simulator.load_parallel(str(file_name), 4)) == 0
+    file_name.write_text("header\nPy,1,2,A1,English,1.0")        # No newline at the end
+    assert [course.label() for course in simulator.load_parallel(str(file_name), 4).values()] == ["Py_A1_English"]
@@ -0,0 +1,63 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import pickle
+
+import pytest
+
+from academy_stats import AcademyAVL
+from course import Course
+from paquete.avl_tree import AVL
+from paquete.persistent_avl_tree import PersistentAVL
+
+def check_avl(tree):
+    """Checks the heights, balance and parents of all the nodes of an AVL tree."""
+    def height(node):
+        if node is None:
+            return 0
+        left, right = height(node._left), height(node._right)
+        assert abs(left - right) <= 1 and node._height == 1 + max(left, right)
+        for child in (node._left, node._right):
+            assert child is None or child._parent is node
+        return 1 + max(left, right)
+    height(tree._root)
+
+def courses(n):
+    return [Course(f"Course {i}", i % 7 + 1, i % 5 + 1, "B1", "English", 2.5) for i in range(n)]
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_round_trip_then_mutate(protocol):
+    tree = AcademyAVL.from_sorted(((c.key(), c) for c in courses(100)), sort=True)
+    copy = pickle.loads(pickle.dumps(tree, protocol))
+    check_avl(copy)
+    assert list(copy) == list(tree)
+    assert copy.stats.total_benefit() == tree.stats.total_benefit()
+    assert copy.select(10).key() == tree.select(10).key()
+    for key in list(copy)[::3]:
+        del copy[key]
+    copy[Course("New", 1, 1, "A1", "x", 1.0).key()] = Course("New", 1, 1, "A1", "x", 1.0)
+    check_avl(copy)
+    assert len(tree) == 100
+
+def test_out_of_band_buffers():
+    tree = AVL.from_sorted((f"key {i:04}", i) for i in range(1000))
+    buffers = []
+    data = pickle.dumps(tree, 5, buffer_callback=buffers.append)
+    assert len(buffers) == 2 # Bytes and offsets of the keys
+    assert list(pickle.loads(data, buffers=buffers).items()) == list(tree.items())
+
+def test_persistent_round_trip_then_delete():
+    tree = pickle.loads(pickle.dumps(PersistentAVL.from_sorted((i, i) for i in range(10))))
+    del tree[tree._root._element._key] # Node with two children
+    snapshot = tree.snapshot()
+    for i in (0, 9, 3):
+        del tree[i]
+    check_avl(tree)
+    assert list(tree) == [1, 2, 4, 6, 7, 8]
+    assert list(snapshot) == [0, 1, 2, 3, 4, 6, 7, 8, 9]
+
+def test_deep_tree_has_no_recursion():
+    tree = AVL()
+    for i in range(20000):
+        tree[i] = i
+    assert list(pickle.loads(pickle.dumps(tree)).items()) == list(tree.items())
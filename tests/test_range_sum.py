@@ -0,0 +1,59 @@
+# Lucía Vega Navarrete. lucia.vega.navarrete@udc.es
+# Ainhoa de Diego Silva. ainhoa.dediego.silva@udc.es
+
+import random
+
+import pytest
+
+from academy_stats import AcademyAVL
+from course import Course
+from paquete.order_statistic_tree import OrderStatisticAVL
+from paquete.range_sum_tree import RangeSumAVL
+
+def academy(rng, n):
+    tree = AcademyAVL()
+    for _ in range(n):
+        course = Course(rng.choice(["Py", "Python", "Java", "Ja", "Go"]) + str(rng.randrange(20)), rng.randint(1, 50), rng.randint(1, 30),
+                        rng.choice(["A1", "B1", "C1"]), rng.choice(["English", "Spanish"]), rng.choice([1.0, 2.5]))
+        tree[course.key()] = course
+    for key in rng.sample(list(tree), len(tree) // 5):
+        del tree[key]
+    return tree
+
+def test_sum_range():
+    rng = random.Random(1)
+    tree = academy(rng, 400)
+    keys = list(tree)
+    bounds = [None] + keys[::17] + ["", "Go", "Python_Z", "~"]
+    for _ in range(300):
+        start, stop = rng.choice(bounds), rng.choice(bounds)
+        courses = [course for key, course in tree.items() if (start is None or start <= key) and (stop is None or key < stop)]
+        assert tree.sum_range(start, stop, "number_students") == sum(course.number_students for course in courses)
+        assert tree.sum_range(start, stop, "benefit") == pytest.approx(sum(course.benefit for course in courses))
+    with pytest.raises(ValueError):
+        tree.sum_range(None, None, "price")
+    assert RangeSumAVL(fields=("x",)).sum_range(None, None, "x") == 0
+
+def test_sum_prefix():
+    tree = academy(random.Random(2), 300)
+    for prefix in ("", "P", "Py", "Python", "Python_B1", "Ja", "Z"):
+        courses = [course for key, course in tree.items() if key.startswith(prefix)]
+        assert tree.sum_prefix(prefix, "number_students") == sum(course.number_students for course in courses)
+
+def test_select_rank_and_count_range():
+    rng = random.Random(3)
+    keys = sorted(rng.sample(range(5000), 700))
+    tree = OrderStatisticAVL.from_sorted((k, k) for k in keys)
+    for k in rng.sample(keys, 200):
+        del tree[k]
+        keys.remove(k)
+    for i in range(len(keys)):
+        assert tree.select(i).key() == keys[i]
+    with pytest.raises(IndexError):
+        tree.select(len(keys))
+    for _ in range(200):
+        start, stop = rng.choice([None, rng.randrange(-1, 5001)]), rng.choice([None, rng.randrange(-1, 5001)])
+        expected = len([k for k in keys if (start is None or start <= k) and (stop is None or k < stop)])
+        assert tree.count_range(start, stop) == expected
+        if start is not None:
+            assert tree.rank(start) == len([k for k in keys if k < start])